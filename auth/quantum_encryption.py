@@ -1,29 +1,67 @@
 from pqcrypto.kem.kyber512 import generate_keypair, encrypt, decrypt
+from cryptography.hazmat.primitives.ciphers.aead import ChaCha20Poly1305
+from typing import Union
 import base64
+import os
+
+def _as_bytes(key: Union[str, bytes]) -> bytes:
+    """Accept keys either raw or base64-encoded."""
+    return key if isinstance(key, bytes) else base64.b64decode(key)
 
 class QuantumEncryption:
     @staticmethod
     def generate_kyber_keypair():
-        """Generate a Kyber public/private key pair."""
+        """Generate a Kyber public/private key pair as raw bytes."""
         public_key, private_key = generate_keypair()
         return {
-            'public_key': base64.b64encode(public_key).decode('utf-8'),
-            'private_key': base64.b64encode(private_key).decode('utf-8')
+            'public_key': public_key,
+            'private_key': private_key
         }
 
     @staticmethod
-    def encrypt_data(public_key: str, plaintext: str):
-        """Encrypt data using Kyber public key."""
-        decoded_public_key = base64.b64decode(public_key)
-        ciphertext, shared_secret = encrypt(decoded_public_key)
+    def serialize_key(key: bytes) -> str:
+        """Encode a raw key for text channels (network, disk)."""
+        return base64.b64encode(key).decode('utf-8')
+
+    @staticmethod
+    def deserialize_key(key: str) -> bytes:
+        """Decode a key produced by serialize_key."""
+        return base64.b64decode(key)
+
+    @staticmethod
+    def encrypt_data(public_key: Union[str, bytes], plaintext: Union[str, bytes]):
+        """Encrypt data using Kyber public key.
+        
+        The Kyber shared secret keys a ChaCha20-Poly1305 encryption of
+        the plaintext and is never returned; only the private key holder
+        can recover it (see decrypt_payload). Base64 keys are still
+        accepted, but raw bytes skip the decode.
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        ciphertext, shared_secret = encrypt(_as_bytes(public_key))
+        nonce = os.urandom(12)
+        payload = ChaCha20Poly1305(shared_secret[:32]).encrypt(nonce, plaintext, None)
         return {
             'ciphertext': base64.b64encode(ciphertext).decode('utf-8'),
-            'shared_secret': base64.b64encode(shared_secret).decode('utf-8')
+            'kem_ct': ciphertext,
+            'nonce': nonce,
+            'ct': payload
         }
 
     @staticmethod
-    def decrypt_data(private_key: str, ciphertext: str):
+    def decrypt_data(private_key: Union[str, bytes], ciphertext: Union[str, bytes]):
         """Decrypt data using Kyber private key."""
-        decoded_private_key = base64.b64decode(private_key)
-        decoded_ciphertext = base64.b64decode(ciphertext)
-        return decrypt(decoded_private_key, decoded_ciphertext) 
\ No newline at end of file
+        decoded_private_key = _as_bytes(private_key)
+        decoded_ciphertext = _as_bytes(ciphertext)
+        return decrypt(decoded_private_key, decoded_ciphertext)
+
+    @staticmethod
+    def decrypt_payload(private_key: Union[str, bytes], encrypted: dict) -> bytes:
+        """Recover the plaintext from an encrypt_data result."""
+        shared_secret = decrypt(_as_bytes(private_key), encrypted['kem_ct'])
+        return ChaCha20Poly1305(shared_secret[:32]).decrypt(
+            encrypted['nonce'],
+            encrypted['ct'],
+            None
+        )
@@ -22,7 +22,7 @@ class ReceptorError(SpatialAuthError):
     """Raised for receptor-related errors."""
     pass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SphericalCoordinates:
     """Immutable spherical coordinates representation."""
     r: float      # radius (distance from center)
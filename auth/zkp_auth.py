@@ -1,31 +1,181 @@
 import hashlib
-import random
-import secrets
+import heapq
+import hmac
+import ipaddress
+import os
 import time
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import logging
-from dataclasses import dataclass
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.exceptions import InvalidKey
+from dataclasses import dataclass, field
 import base64
-from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock, local
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
-@dataclass
+logger = logging.getLogger(__name__)
+audit_logger = logging.getLogger("zkp_audit")
+
+# BLAKE2b-256 over one buffer: libsodium (runtime-dispatched AVX2) when
+# PyNaCl is installed, the stdlib implementation otherwise
+try:
+    from nacl.bindings import crypto_generichash_blake2b_salt_personal
+    
+    def _blake2b_256(data: bytes) -> bytes:
+        return crypto_generichash_blake2b_salt_personal(data, digest_size=32)
+except ImportError:
+    def _blake2b_256(data: bytes) -> bytes:
+        return hashlib.blake2b(data, digest_size=32).digest()
+
+class _ChallengeRNG:
+    """
+    AES-256-CTR keystream generator for challenge randomness.
+    
+    Seeded from os.urandom and reseeded every 2**20 draws (and after a
+    fork, so parent and child never share a stream). Keystream is made
+    4 KiB at a time, so the OS is only asked for 48 bytes per reseed.
+    """
+    _BLOCK = bytes(4096)
+    _RESEED_INTERVAL = 1 << 20
+    
+    def __init__(self):
+        self._key = b""
+        self._reseed()
+        
+    def _reseed(self) -> None:
+        # Fresh OS entropy mixed with the previous key
+        self._key = hashlib.blake2b(
+            self._key + os.urandom(32), digest_size=32
+        ).digest()
+        self._encryptor = Cipher(
+            algorithms.AES(self._key),
+            modes.CTR(os.urandom(16))
+        ).encryptor()
+        self._buf = b""
+        self._pos = 0
+        self._draws = 0
+        self._fork_generation = _fork_generation
+        
+    def read(self, n: int) -> bytes:
+        """
+        Take n bytes of keystream.
+        
+        Args:
+            n: Number of bytes (at most 4096)
+            
+        Returns:
+            bytes: Bytes never handed out before
+        """
+        if (self._draws >= self._RESEED_INTERVAL
+                or self._fork_generation != _fork_generation):
+            self._reseed()
+        self._draws += 1
+        pos = self._pos
+        if pos + n > len(self._buf):
+            # AES-CTR over zeros is the raw keystream
+            self._buf = self._encryptor.update(self._BLOCK)
+            pos = 0
+        self._pos = pos + n
+        return self._buf[pos:pos + n]
+
+_fork_generation = 0
+
+def _after_fork_in_child() -> None:
+    global _fork_generation
+    _fork_generation += 1
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+# One generator per thread, so drawing needs no lock
+_thread_rng = local()
+
+def _challenge_random_bytes(n: int) -> bytes:
+    rng = getattr(_thread_rng, "rng", None)
+    if rng is None:
+        rng = _thread_rng.rng = _ChallengeRNG()
+    return rng.read(n)
+
+# Derived keys keyed by (salt, SHA-256 of credential), so raw
+# credentials are never retained by the cache
+_KEY_CACHE_SIZE = 1024
+_key_cache: "OrderedDict[Tuple[bytes, bytes], bytes]" = OrderedDict()
+_key_cache_lock = Lock()
+
+def _derive_key(credential: str, salt: bytes) -> bytes:
+    """
+    Stretch a credential with PBKDF2, reusing earlier derivations.
+    
+    Args:
+        credential: The secret credential
+        salt: KDF salt
+        
+    Returns:
+        bytes: The 32-byte derived key
+    """
+    cache_key = (salt, hashlib.sha256(credential.encode()).digest())
+    with _key_cache_lock:
+        key = _key_cache.get(cache_key)
+        if key is not None:
+            _key_cache.move_to_end(cache_key)
+            return key
+            
+    # Straight into OpenSSL's PBKDF2 (SHA-NI accelerated where available)
+    key = hashlib.pbkdf2_hmac('sha256', credential.encode(), salt, 100000, dklen=32)
+    
+    with _key_cache_lock:
+        _key_cache[cache_key] = key
+        if len(_key_cache) > _KEY_CACHE_SIZE:
+            _key_cache.popitem(last=False)
+    return key
+
+@lru_cache(maxsize=4096)
+def _pack_ip(ip_address: str) -> bytes:
+    """
+    Pack an IPv4/IPv6 address into its 4- or 16-byte binary form.
+    
+    Args:
+        ip_address: Address string; non-IP identifiers are kept as UTF-8
+        
+    Returns:
+        bytes: Compact key for per-client tables
+    """
+    try:
+        return ipaddress.ip_address(ip_address).packed
+    except ValueError:
+        return ip_address.encode()
+
+def clear_derived_keys() -> None:
+    """Drop all cached derived keys (e.g. on logout)."""
+    with _key_cache_lock:
+        _key_cache.clear()
+
+@dataclass(slots=True)
 class ProofChallenge:
     """Challenge data for ZKP verification."""
     challenge_number: int
-    nonce: str
-    timestamp: float
-    expiry: float  # Challenge expiry time in seconds
+    nonce: bytes
+    timestamp: float  # time.monotonic() at issue
+    expiry: float  # Challenge expiry time in seconds, same clock
+    # Proof inputs, encoded once per challenge rather than once per proof
+    number_bytes: bytes = field(default=b"", repr=False, compare=False)
+    nonce_bytes: bytes = field(default=b"", repr=False, compare=False)
+    
+    def __post_init__(self):
+        if not self.number_bytes:
+            self.number_bytes = str(self.challenge_number).encode()
+        if not self.nonce_bytes:
+            self.nonce_bytes = (
+                self.nonce if isinstance(self.nonce, bytes)
+                else self.nonce.encode()
+            )
 
-@dataclass
+@dataclass(slots=True)
 class ProofResponse:
     """Response data containing proof."""
-    proof_hash: str
-    nonce: str
-    timestamp: float
+    proof_hash: bytes  # Raw 32-byte digest
+    nonce: bytes
+    timestamp: float  # time.monotonic() when the proof was made
 
 class AuthenticationError(Exception):
     """Base exception for authentication errors."""
@@ -40,6 +190,14 @@ class ChallengeExpired(AuthenticationError):
     pass
 
 class ZeroKnowledgeAuthenticator:
+    __slots__ = (
+        "secret_key", "_proof_hasher", "commitment",
+        "_commitment_b64_bytes", "max_attempts", "attempt_window",
+        "challenge_timeout",
+        "attempt_log", "max_tracked_ips", "active_challenges",
+        "_expiry_heap",
+    )
+    
     def __init__(
         self, 
         secret_credential: str,
@@ -55,37 +213,79 @@ class ZeroKnowledgeAuthenticator:
             max_attempts: Maximum authentication attempts per window
             attempt_window: Time window for rate limiting (seconds)
             challenge_timeout: Challenge expiry time (seconds)
+            
+        Raises:
+            ValueError: If attempt_window is not positive or max_attempts
+                is less than 1
         """
+        if attempt_window <= 0:
+            raise ValueError("attempt_window must be positive")
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+            
         # Derive key using PBKDF2
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=b"static_salt",  # In production, use a unique salt per user
-            iterations=100000,
-        )
         self.secret_key = base64.b64encode(
-            kdf.derive(secret_credential.encode())
+            _derive_key(
+                secret_credential,
+                b"static_salt"  # In production, use a unique salt per user
+            )
         )
         
-        # Create public commitment
+        # BLAKE2b-256 state with the secret key already absorbed; each
+        # proof hashes a copy, so the key is never compressed again
+        self._proof_hasher = hashlib.blake2b(digest_size=32)
+        self._proof_hasher.update(self.secret_key)
+        
+        # Create public commitment (raw digest; base64 only for display)
         self.commitment = self._hash(self.secret_key)
+        self._commitment_b64_bytes = base64.b64encode(self.commitment)
         
         # Rate limiting
         self.max_attempts = max_attempts
         self.attempt_window = attempt_window
         self.challenge_timeout = challenge_timeout
-        self.attempt_log = defaultdict(list)  # IP -> list of timestamps
-        
-        # Audit logging
-        self.logger = logging.getLogger(__name__)
-        self.audit_logger = logging.getLogger("zkp_audit")
+        # Packed IP -> [previous window count, current window count,
+        # current window start], least recently seen IP first
+        self.attempt_log: "OrderedDict[bytes, list]" = OrderedDict()
+        self.max_tracked_ips = 10000
         
         # Challenge tracking
-        self.active_challenges: Dict[str, ProofChallenge] = {}
+        self.active_challenges: Dict[bytes, ProofChallenge] = {}
+        # (expiry, nonce) for every issued challenge, soonest expiry first
+        self._expiry_heap: List[Tuple[float, bytes]] = []
+        
+    def _random_bytes(self, n: int) -> bytes:
+        """
+        Take n cryptographically secure random bytes.
+        
+        Args:
+            n: Number of bytes (at most 4096)
+            
+        Returns:
+            bytes: Bytes from this thread's AES-CTR stream
+        """
+        return _challenge_random_bytes(n)
         
-    def _hash(self, *values: bytes) -> str:
+    def _hash(self, *values: bytes) -> bytes:
         """
-        Create a cryptographically secure hash.
+        Create a cryptographically secure hash as the raw digest.
+        
+        Args:
+            values: Values to hash together
+            
+        Returns:
+            bytes: The 32-byte digest
+        """
+        # One buffer, one call: same digest as hashing the values in turn
+        buf = b"".join(
+            value.encode() if isinstance(value, str) else value
+            for value in values
+        )
+        return _blake2b_256(buf)
+        
+    def _hash_b64(self, *values: bytes) -> str:
+        """
+        Create a cryptographically secure hash as base64, for logging.
         
         Args:
             values: Values to hash together
@@ -93,25 +293,69 @@ class ZeroKnowledgeAuthenticator:
         Returns:
             str: Resulting hash
         """
-        hasher = hashlib.blake2b(digest_size=32)
-        for value in values:
-            if isinstance(value, str):
-                value = value.encode()
-            hasher.update(value)
-        return base64.b64encode(hasher.digest()).decode()
-        
-    def _check_rate_limit(self, ip_address: str) -> None:
+        return base64.b64encode(self._hash(*values)).decode()
+        
+    def _commitment_matches(self, public_commitment) -> bool:
+        """
+        Compare a commitment against ours in constant time.
+        
+        Args:
+            public_commitment: Raw digest bytes or its base64 string
+            
+        Returns:
+            bool: True if the commitments are equal; False for any other
+            input type or a non-ASCII string
+        """
+        if isinstance(public_commitment, bytes):
+            return hmac.compare_digest(public_commitment, self.commitment)
+        if isinstance(public_commitment, str):
+            try:
+                encoded = public_commitment.encode('ascii')
+            except UnicodeEncodeError:
+                return False
+            return hmac.compare_digest(encoded, self._commitment_b64_bytes)
+        return False
+        
+    def _check_rate_limit(self, ip_address: str, attempts: int = 1) -> None:
         """
         Check if rate limit is exceeded for an IP.
         
         Args:
             ip_address: IP address to check
+            attempts: Number of attempts to charge if they all fit
             
         Raises:
             RateLimitExceeded: If rate limit is exceeded
         """
-        # Implement rate limiting logic here
-        # ...
+        now = time.monotonic()
+        window = self.attempt_window
+        key = _pack_ip(ip_address)
+        counter = self.attempt_log.get(key)
+        if counter is None:
+            counter = [0, 0, now]
+            self.attempt_log[key] = counter
+            if len(self.attempt_log) > self.max_tracked_ips:
+                self.attempt_log.popitem(last=False)
+        else:
+            self.attempt_log.move_to_end(key)
+            
+        # Roll the window forward; after two idle windows nothing counts
+        elapsed = now - counter[2]
+        if elapsed >= 2 * window:
+            counter[0], counter[1], counter[2] = 0, 0, now
+        elif elapsed >= window:
+            counter[0], counter[1] = counter[1], 0
+            counter[2] += window
+            
+        # Sliding-window estimate: the previous window's count weighted by
+        # how much of it still overlaps the last attempt_window seconds
+        overlap = 1.0 - (now - counter[2]) / window
+        if counter[0] * overlap + counter[1] + attempts > self.max_attempts:
+            audit_logger.warning("Rate limit exceeded for IP: %s", ip_address)
+            raise RateLimitExceeded(
+                f"Too many attempts from {ip_address}"
+            )
+        counter[1] += attempts
 
     def generate_challenge(self, ip_address: str) -> ProofChallenge:
         """
@@ -127,19 +371,26 @@ class ZeroKnowledgeAuthenticator:
             RateLimitExceeded: If rate limit is exceeded
         """
         self._check_rate_limit(ip_address)
+        self._cleanup_expired_challenges()
         
-        now = time.time()
+        now = time.monotonic()
+        challenge_number = (
+            int.from_bytes(self._random_bytes(4), 'little') & 0xFFFFF
+        ) + 1
+        nonce = self._random_bytes(32)
         challenge = ProofChallenge(
-            challenge_number=random.randint(1, 1000000),
-            nonce=secrets.token_urlsafe(32),
+            challenge_number=challenge_number,
+            nonce=nonce,
             timestamp=now,
-            expiry=now + self.challenge_timeout
+            expiry=now + self.challenge_timeout,
+            number_bytes=str(challenge_number).encode(),
+            nonce_bytes=nonce
         )
         
         self.active_challenges[challenge.nonce] = challenge
-        self.audit_logger.info(
-            f"Challenge generated for IP: {ip_address}"
-        )
+        heapq.heappush(self._expiry_heap, (challenge.expiry, challenge.nonce))
+        if audit_logger.isEnabledFor(logging.INFO):
+            audit_logger.info("Challenge generated for IP: %s", ip_address)
         
         return challenge
         
@@ -156,29 +407,64 @@ class ZeroKnowledgeAuthenticator:
         Raises:
             ChallengeExpired: If the challenge has expired
         """
-        now = time.time()
+        now = time.monotonic()
         if now > challenge.expiry:
             raise ChallengeExpired("Challenge has expired")
             
-        # Combine secret key with challenge to create proof
-        proof_hash = self._hash(
-            self.secret_key,
-            str(challenge.challenge_number).encode(),
-            challenge.nonce.encode()
-        )
+        proof_hash = self._expected_proof(challenge)
         
-        self.logger.debug("Generated proof for challenge")
+        logger.debug("Generated proof for challenge")
         return ProofResponse(
             proof_hash=proof_hash,
             nonce=challenge.nonce,
             timestamp=now
         )
         
+    def _expected_proof(self, challenge: ProofChallenge) -> bytes:
+        """
+        Compute the proof digest for a challenge.
+        
+        Combines the secret key with the challenge; same digest as
+        _hash(secret_key, number_bytes, nonce_bytes).
+        
+        Args:
+            challenge: The challenge being answered
+            
+        Returns:
+            bytes: The 32-byte proof digest
+        """
+        hasher = self._proof_hasher.copy()
+        hasher.update(challenge.number_bytes)
+        hasher.update(challenge.nonce_bytes)
+        return hasher.digest()
+        
+    def _proof_matches(
+        self,
+        proof: ProofResponse,
+        challenge: ProofChallenge
+    ) -> bool:
+        """
+        Check a proof's digest against the expected one in constant time.
+        
+        Args:
+            proof: The proof to check
+            challenge: The challenge it answers
+            
+        Returns:
+            bool: True if the proof digest is correct
+        """
+        if not isinstance(proof.proof_hash, bytes):
+            return False
+        return hmac.compare_digest(
+            proof.proof_hash,
+            self._expected_proof(challenge)
+        )
+        
     def verify_proof(
         self, 
         proof: ProofResponse, 
         challenge: ProofChallenge,
-        public_commitment: str,
+        public_commitment: bytes,
         ip_address: str
     ) -> bool:
         """
@@ -187,7 +473,7 @@ class ZeroKnowledgeAuthenticator:
         Args:
             proof: The proof to verify
             challenge: The original challenge
-            public_commitment: The public commitment hash
+            public_commitment: The public commitment (raw digest or base64)
             ip_address: IP address making the verification request
             
         Returns:
@@ -205,7 +491,7 @@ class ZeroKnowledgeAuthenticator:
             if not stored_challenge or stored_challenge != challenge:
                 raise AuthenticationError("Invalid challenge")
                 
-            now = time.time()
+            now = time.monotonic()
             if now > challenge.expiry:
                 raise ChallengeExpired("Challenge has expired")
                 
@@ -214,36 +500,100 @@ class ZeroKnowledgeAuthenticator:
                 raise AuthenticationError("Proof timestamp out of range")
                 
             # Verify commitment matches
-            if public_commitment != self.commitment:
+            if not self._commitment_matches(public_commitment):
                 raise AuthenticationError("Public commitment mismatch")
                 
+            # Verify the proof itself
+            if not self._proof_matches(proof, challenge):
+                raise AuthenticationError("Invalid proof")
+                
             # Clean up used challenge
             del self.active_challenges[proof.nonce]
             
-            self.audit_logger.info(
-                f"Successful verification for IP: {ip_address}"
-            )
+            if audit_logger.isEnabledFor(logging.INFO):
+                audit_logger.info(
+                    "Successful verification for IP: %s", ip_address
+                )
             return True
             
         except AuthenticationError as e:
-            self.audit_logger.warning(
-                f"Verification failed for IP {ip_address}: {str(e)}"
+            audit_logger.warning(
+                "Verification failed for IP %s: %s", ip_address, e
             )
             raise
             
-        finally:
-            # Cleanup expired challenges periodically
-            self._cleanup_expired_challenges()
+    def verify_proof_batch(
+        self,
+        proofs: List[ProofResponse],
+        challenges: List[ProofChallenge],
+        public_commitment: bytes,
+        ip_address: str
+    ) -> List[bool]:
+        """
+        Verify many proofs from one client in a single pass.
+        
+        Applies the same checks as verify_proof, but reads the clock and
+        compares the commitment once per batch rather than per proof. The
+        batch is charged as len(proofs) attempts up front, so it is either
+        rejected whole or no challenge is consumed by a later rate limit.
+        
+        Args:
+            proofs: The proofs to verify
+            challenges: The original challenges, parallel to proofs
+            public_commitment: The public commitment (raw digest or base64)
+            ip_address: IP address making the verification request
+            
+        Returns:
+            List[bool]: Whether each proof is valid
+            
+        Raises:
+            RateLimitExceeded: If the batch would exceed the rate limit
+        """
+        if len(proofs) != len(challenges):
+            raise ValueError("proofs and challenges must have the same length")
+            
+        self._check_rate_limit(ip_address, len(proofs))
+        
+        results = []
+        now = time.monotonic()
+        commitment_ok = self._commitment_matches(public_commitment)
+        for proof, challenge in zip(proofs, challenges):
+            stored_challenge = self.active_challenges.get(proof.nonce)
+            if not stored_challenge or stored_challenge != challenge:
+                reason = "Invalid challenge"
+            elif now > challenge.expiry:
+                reason = "Challenge has expired"
+            elif abs(proof.timestamp - now) > 5:  # 5 second tolerance
+                reason = "Proof timestamp out of range"
+            elif not commitment_ok:
+                reason = "Public commitment mismatch"
+            elif not self._proof_matches(proof, challenge):
+                reason = "Invalid proof"
+            else:
+                del self.active_challenges[proof.nonce]
+                results.append(True)
+                continue
+                
+            audit_logger.warning(
+                "Verification failed for IP %s: %s", ip_address, reason
+            )
+            results.append(False)
+            
+        if audit_logger.isEnabledFor(logging.INFO):
+            audit_logger.info(
+                "Batch verification for IP: %s: %d/%d succeeded",
+                ip_address, sum(results), len(results)
+            )
+        return results
             
     def _cleanup_expired_challenges(self) -> None:
         """Remove expired challenges from storage."""
-        now = time.time()
-        expired = [
-            nonce for nonce, challenge in self.active_challenges.items()
-            if now > challenge.expiry
-        ]
-        for nonce in expired:
-            del self.active_challenges[nonce]
+        # Pop only what has expired; already-verified nonces are skipped
+        now = time.monotonic()
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            _, nonce = heapq.heappop(heap)
+            self.active_challenges.pop(nonce, None)
 
 class Entity:
     def __init__(
@@ -269,8 +619,8 @@ class Entity:
             attempt_window=attempt_window
         )
         
-    def get_public_commitment(self) -> str:
-        """Get the public commitment hash."""
+    def get_public_commitment(self) -> bytes:
+        """Get the public commitment hash (raw digest)."""
         return self.authenticator.commitment
         
     def prove_identity(
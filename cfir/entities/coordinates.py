@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict
 import math
 
-@dataclass
+@dataclass(slots=True)
 class SphericalCoordinates:
     """Represents a point in spherical coordinates."""
     r: float      # radius (distance from origin)
@@ -19,6 +19,24 @@ class SphericalCoordinates:
         self.theta = self.theta % math.pi
         self.phi = self.phi % (2 * math.pi)
         
+    @classmethod
+    def from_radians_unchecked(
+        cls,
+        r: float,
+        theta: float,
+        phi: float
+    ) -> 'SphericalCoordinates':
+        """Create without validation or normalization.
+        
+        Only for values already known to be in range (r >= 0, theta in
+        [0, π), phi in [0, 2π)), e.g. produced by bounded RNG draws.
+        """
+        coords = object.__new__(cls)
+        coords.r = r
+        coords.theta = theta
+        coords.phi = phi
+        return coords
+        
     def distance_to(self, other: 'SphericalCoordinates') -> float:
         """Calculate distance to another point."""
         # Convert to Cartesian coordinates for distance calculation
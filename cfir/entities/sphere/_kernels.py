@@ -0,0 +1,34 @@
+"""
+Numba kernels for batched cell movement.
+"""
+
+import math
+from numba import njit
+
+# No fastmath: the horizon check is a security boundary and must compare
+# exactly as the scalar check_spatial_boundaries does
+
+@njit(cache=True, nogil=True)
+def _move_cells(indices, new_r, new_theta, new_phi,
+                r, theta, phi, horizon, alive, live, doomed):
+    """Write new positions into live pool slots and find horizon breaches.
+
+    Angles are normalized as SphericalCoordinates does. live[j] records
+    whether indices[j] was occupied; the slots now beyond their horizon
+    are written to the front of doomed and their count is returned.
+    """
+    n_doomed = 0
+    two_pi = 2.0 * math.pi
+    for j in range(indices.shape[0]):
+        i = indices[j]
+        if not alive[i]:
+            live[j] = False
+            continue
+        live[j] = True
+        r[i] = new_r[j]
+        theta[i] = new_theta[j] % math.pi
+        phi[i] = new_phi[j] % two_pi
+        if r[i] > horizon[i]:
+            doomed[n_doomed] = i
+            n_doomed += 1
+    return n_doomed
@@ -1,15 +1,81 @@
 import threading
 import time
 import math
+import heapq
+import itertools
 from typing import Dict, Any, Optional, Tuple, List
 from dataclasses import dataclass
 import logging
-from cfir.entities.sphere.sphere_entity import SphericalCoordinates
+import numpy as np
+from cfir.entities.coordinates import SphericalCoordinates
+from cfir.entities.sphere._kernels import _move_cells
 
+logger = logging.getLogger(__name__)
+
+class _DestructionScheduler:
+    """Single background thread that destroys cells when their lifespans end.
+    
+    Cells are held strongly until they expire, as a per-cell Timer would,
+    so an otherwise unreferenced cell still destroys itself and notifies
+    its observers on time.
+    """
     
+    def __init__(self):
+        self._heap: List[Tuple[float, int, 'SelfDestructingDataCell']] = []
+        self._cond = threading.Condition()
+        self._counter = itertools.count()  # tie-breaker for equal expiries
+        self._thread: Optional[threading.Thread] = None
+        
+    def schedule(self, cell: 'SelfDestructingDataCell', delay: float) -> None:
+        """Destroy cell after delay seconds unless it is destroyed first."""
+        expiry = time.monotonic() + delay
+        with self._cond:
+            heapq.heappush(
+                self._heap,
+                (expiry, next(self._counter), cell)
+            )
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="cell_destruction",
+                    daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+            
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                expiry, _, cell = self._heap[0]
+                delay = expiry - time.monotonic()
+                if delay > 0:
+                    # Woken early if an earlier expiry is scheduled
+                    self._cond.wait(timeout=delay)
+                    continue
+                heapq.heappop(self._heap)
+                
+            # Cells already destroyed are simply skipped
+            if cell.is_alive():
+                try:
+                    cell.destroy()
+                except Exception as e:
+                    logger.error("Timed destruction failed: %s", e)
+            # Don't pin the last cell while idle
+            del cell
+
+_scheduler = _DestructionScheduler()
+
 class SelfDestructingDataCell:
     """Self-destructing data cell with observer pattern."""
     
+    __slots__ = (
+        "_pool", "_slot", "data", "_coordinates", "_horizon_radius",
+        "lifespan_seconds", "creation_time", "_is_destroyed", "_lock",
+        "_observers",
+    )
+    
     def __init__(
         self, 
         data: Any,
@@ -26,34 +92,58 @@ class SelfDestructingDataCell:
             horizon_radius: Maximum allowed radius before spatial destruction
             lifespan_seconds: Time in seconds before automatic destruction
         """
+        # Set when the cell is added to a CellPool (slot in its arrays)
+        self._pool: Optional['CellPool'] = None
+        self._slot = -1
         self.data = data
         self.coordinates = coordinates
         self.horizon_radius = horizon_radius
         self.lifespan_seconds = lifespan_seconds
-        self.creation_time = time.time()
-        self._destruction_timer: Optional[threading.Timer] = None
+        self.creation_time = time.monotonic()
         self._is_destroyed = False
-        self._lock = threading.Lock()
+        # Writers only; reentrant because update_coordinates may destroy
+        self._lock = threading.RLock()
         self._observers: List[callable] = []
         
-        # Configure logging
-        self.logger = logging.getLogger(__name__)
-        
         # Start timer-based destruction if lifespan is set
         if lifespan_seconds is not None:
             self.set_timer_destruction()
             
+    @property
+    def coordinates(self) -> SphericalCoordinates:
+        if self._pool is not None:
+            return self._pool.coordinates_at(self._slot)
+        return self._coordinates
+        
+    @coordinates.setter
+    def coordinates(self, value: SphericalCoordinates) -> None:
+        if self._pool is not None:
+            self._pool.set_coordinates(self._slot, value)
+        else:
+            self._coordinates = value
+            
+    @property
+    def horizon_radius(self) -> float:
+        if self._pool is not None:
+            return float(self._pool.horizon[self._slot])
+        return self._horizon_radius
+        
+    @horizon_radius.setter
+    def horizon_radius(self, value: float) -> None:
+        if self._pool is not None:
+            self._pool.set_horizon(self._slot, value)
+        else:
+            self._horizon_radius = value
+            
     def set_timer_destruction(self) -> None:
         """Start the timer for automatic data destruction."""
         if self.lifespan_seconds is not None:
-            self._destruction_timer = threading.Timer(
-                self.lifespan_seconds, 
-                self.destroy
-            )
-            self._destruction_timer.start()
-            self.logger.info(
-                f"Timer-based destruction set for {self.lifespan_seconds} seconds"
-            )
+            _scheduler.schedule(self, self.lifespan_seconds)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Timer-based destruction set for %s seconds",
+                    self.lifespan_seconds
+                )
             
     def update_coordinates(self, new_coordinates: SphericalCoordinates) -> bool:
         """
@@ -95,15 +185,21 @@ class SelfDestructingDataCell:
             if self._is_destroyed:
                 return
                 
-            # Cancel any pending destruction timer
-            if self._destruction_timer:
-                self._destruction_timer.cancel()
-                
-            # Securely delete data by overwriting
+            # Securely delete data by overwriting. The data is cleared
+            # before the flag is set, so a lock-free reader that still
+            # sees the cell alive gets either the data or None.
             self.data = None
             self._is_destroyed = True
             
-            self.logger.info("Data cell destroyed")
+            # Take the final position back out of the pool, freeing the slot
+            if self._pool is not None:
+                pool = self._pool
+                self._coordinates = self.coordinates
+                self._horizon_radius = self.horizon_radius
+                self._pool = None
+                pool._release(self._slot)
+                
+            logger.info("Data cell destroyed")
             
             self.notify_observers("Data cell destroyed")
             
@@ -115,11 +211,15 @@ class SelfDestructingDataCell:
         """
         Retrieve the cell's data if it still exists.
         
+        Not locked: destruction is one-way and clears the data before
+        setting the flag.
+        
         Returns:
             The data if cell is alive, None if destroyed
         """
-        with self._lock:
-            return self.data if not self._is_destroyed else None
+        if self._is_destroyed:
+            return None
+        return self.data
             
     def get_age(self) -> float:
         """
@@ -128,11 +228,140 @@ class SelfDestructingDataCell:
         Returns:
             float: Age in seconds
         """
-        return time.time() - self.creation_time 
+        return time.monotonic() - self.creation_time 
 
     def add_observer(self, observer: callable) -> None:
         self._observers.append(observer)
 
     def notify_observers(self, message: str) -> None:
         for observer in self._observers:
-            observer(message) 
\ No newline at end of file
+            observer(message)
+
+class CellPool:
+    """Structure-of-arrays position and horizon state for many cells.
+    
+    Added cells keep their API but read and write their coordinates and
+    horizon through their slot here, so a whole fleet can be moved and
+    boundary-checked in one vectorized call.
+    """
+    
+    def __init__(self, capacity: int = 64):
+        self.r = np.zeros(capacity)
+        self.theta = np.zeros(capacity)
+        self.phi = np.zeros(capacity)
+        self.horizon = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=np.bool_)
+        self._cells: List[Optional[SelfDestructingDataCell]] = [None] * capacity
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+        
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.alive))
+        
+    def add(self, cell: SelfDestructingDataCell) -> int:
+        """Move a live cell's position and horizon into a pool slot.
+        
+        Args:
+            cell: Cell not yet in any pool
+            
+        Returns:
+            int: The cell's slot index, for use with update_all
+        """
+        with cell._lock:
+            if not cell.is_alive():
+                raise ValueError("Cannot pool a destroyed cell")
+            if cell._pool is not None:
+                raise ValueError("Cell already belongs to a pool")
+            coords = cell.coordinates
+            with self._lock:
+                if not self._free:
+                    self._grow(2 * len(self._cells))
+                slot = self._free.pop()
+                self.r[slot] = coords.r
+                self.theta[slot] = coords.theta
+                self.phi[slot] = coords.phi
+                self.horizon[slot] = cell.horizon_radius
+                self.alive[slot] = True
+                self._cells[slot] = cell
+            cell._slot = slot
+            cell._pool = self
+        return slot
+        
+    def _grow(self, capacity: int) -> None:
+        old = len(self._cells)
+        for name in ("r", "theta", "phi", "horizon", "alive"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:old] = column
+            setattr(self, name, grown)
+        self._cells.extend([None] * (capacity - old))
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        
+    def _release(self, slot: int) -> None:
+        with self._lock:
+            self.alive[slot] = False
+            self._cells[slot] = None
+            self._free.append(slot)
+            
+    def coordinates_at(self, slot: int) -> SphericalCoordinates:
+        # Stored values are already in range, so either coordinates
+        # class (validating or normalizing) accepts them unchanged
+        with self._lock:
+            r, theta, phi = self.r[slot], self.theta[slot], self.phi[slot]
+        return SphericalCoordinates(float(r), float(theta), float(phi))
+        
+    def set_coordinates(self, slot: int, coords: SphericalCoordinates) -> None:
+        # Under the pool lock so update_all never sees a half-written row
+        with self._lock:
+            self.r[slot] = coords.r
+            self.theta[slot] = coords.theta
+            self.phi[slot] = coords.phi
+            
+    def set_horizon(self, slot: int, value: float) -> None:
+        with self._lock:
+            self.horizon[slot] = value
+        
+    def update_all(
+        self,
+        indices: np.ndarray,
+        new_r: np.ndarray,
+        new_theta: np.ndarray,
+        new_phi: np.ndarray
+    ) -> np.ndarray:
+        """
+        Move many cells at once and destroy those beyond their horizon.
+        
+        Equivalent to update_coordinates on each cell. Slots that are
+        already free are left untouched.
+        
+        Args:
+            indices: Slot indices returned by add
+            new_r: New radii, parallel to indices
+            new_theta: New polar angles (normalized to [0, π))
+            new_phi: New azimuthal angles (normalized to [0, 2π))
+            
+        Returns:
+            np.ndarray: True where the cell is still alive after the move
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        new_r = np.asarray(new_r, dtype=np.float64)
+        if np.any(new_r < 0):
+            raise ValueError("Radius must be non-negative")
+            
+        live = np.empty(len(indices), dtype=np.bool_)
+        doomed_slots = np.empty(len(indices), dtype=np.intp)
+        with self._lock:
+            n_doomed = _move_cells(
+                indices, new_r,
+                np.asarray(new_theta, dtype=np.float64),
+                np.asarray(new_phi, dtype=np.float64),
+                self.r, self.theta, self.phi, self.horizon, self.alive,
+                live, doomed_slots
+            )
+            doomed = [self._cells[i] for i in doomed_slots[:n_doomed]]
+            
+        # Destroy outside the pool lock: destroy takes the cell lock first
+        for cell in doomed:
+            cell.destroy()
+            
+        return self.alive[indices] & live
@@ -0,0 +1,120 @@
+import math
+import time
+
+import numpy as np
+
+from cfir.entities.coordinates import SphericalCoordinates
+from cfir.entities.sphere.self_destructing_cell import CellPool, SelfDestructingDataCell
+
+
+def make_cell(data, r=5.0, horizon=10.0, lifespan=None):
+    return SelfDestructingDataCell(
+        data=data,
+        coordinates=SphericalCoordinates(r=r, theta=1.0, phi=2.0),
+        horizon_radius=horizon,
+        lifespan_seconds=lifespan
+    )
+
+
+def test_add_grows_past_initial_capacity():
+    pool = CellPool(capacity=2)
+    cells = [make_cell(i) for i in range(5)]
+    slots = [pool.add(cell) for cell in cells]
+
+    assert sorted(slots) == [0, 1, 2, 3, 4]
+    assert len(pool) == 5
+    for cell in cells:
+        assert cell.coordinates.r == 5.0
+        assert cell.horizon_radius == 10.0
+
+
+def test_destroyed_slot_is_reused():
+    pool = CellPool(capacity=4)
+    first, second, third = (make_cell(i) for i in range(3))
+    pool.add(first)
+    freed = pool.add(second)
+    pool.add(third)
+
+    second.update_coordinates(SphericalCoordinates(r=7.0, theta=1.0, phi=2.0))
+    second.destroy()
+    assert len(pool) == 2
+    # The destroyed cell keeps its last position after leaving the pool
+    assert second.coordinates.r == 7.0
+
+    newcomer = make_cell("new", r=3.0)
+    assert pool.add(newcomer) == freed
+    assert newcomer.coordinates.r == 3.0
+    assert first.get_data() == 0 and third.get_data() == 2
+
+
+def test_update_all_normalizes_angles():
+    pool = CellPool()
+    cell = make_cell("data")
+    slot = pool.add(cell)
+
+    alive = pool.update_all([slot], [4.0], [4.0], [-1.0])
+
+    assert alive.tolist() == [True]
+    assert math.isclose(cell.coordinates.theta, 4.0 - math.pi)
+    assert math.isclose(cell.coordinates.phi, 2 * math.pi - 1.0)
+
+
+def test_update_all_destroys_cells_beyond_horizon():
+    pool = CellPool()
+    cells = [make_cell(i) for i in range(3)]
+    slots = [pool.add(cell) for cell in cells]
+    messages = []
+    cells[1].add_observer(messages.append)
+
+    # Exactly on the horizon is still inside
+    alive = pool.update_all(slots, [10.0, 10.5, 1.0], [0.0] * 3, [0.0] * 3)
+
+    assert alive.tolist() == [True, False, True]
+    assert [cell.get_data() for cell in cells] == [0, None, 2]
+    assert messages == ["Data cell destroyed"]
+    assert len(pool) == 2
+
+    # Freed slots are skipped rather than written
+    assert pool.update_all(slots, [1.0] * 3, [0.0] * 3, [0.0] * 3).tolist() == [
+        True, False, True
+    ]
+
+
+def test_update_all_rejects_negative_radius():
+    pool = CellPool()
+    slot = pool.add(make_cell("data"))
+    try:
+        pool.update_all(np.array([slot]), [-1.0], [0.0], [0.0])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("negative radius accepted")
+
+
+def test_timed_destroy_frees_slot():
+    pool = CellPool()
+    cell = make_cell("data", lifespan=0.05)
+    messages = []
+    cell.add_observer(messages.append)
+    pool.add(cell)
+
+    deadline = time.monotonic() + 2.0
+    while cell.is_alive() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not cell.is_alive()
+    assert cell.get_data() is None
+    assert messages == ["Data cell destroyed"]
+    assert len(pool) == 0
+
+
+def test_pooled_cell_setters_write_through_pool():
+    pool = CellPool()
+    cell = make_cell("data")
+    slot = pool.add(cell)
+
+    cell.horizon_radius = 20.0
+    cell.coordinates = SphericalCoordinates(r=15.0, theta=1.0, phi=2.0)
+
+    assert pool.horizon[slot] == 20.0 and pool.r[slot] == 15.0
+    assert pool.update_all([slot], [15.0], [1.0], [2.0]).tolist() == [True]
@@ -0,0 +1,47 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+from cfir.entities.coordinates import SphericalCoordinates
+from quantum_console.simulation.physics_engine import (
+    MAX_SUBSTEPS,
+    PhysicalProperties,
+    PhysicsEngine,
+)
+
+
+def test_stop_ends_loop_when_updates_fall_behind():
+    engine = PhysicsEngine(thread_pool_size=1)
+    engine.add_entity(
+        SimpleNamespace(id="a", coordinates=SphericalCoordinates(r=1.0, theta=1.0, phi=1.0)),
+        PhysicalProperties(mass=1.0)
+    )
+    since_yield = [0]
+    calls = []
+
+    # Every update takes three timesteps of real time, so the backlog
+    # grows on each wake-up unless the loop caps it
+    def slow_update(delta_time):
+        calls.append(delta_time)
+        since_yield[0] += 1
+        assert since_yield[0] <= MAX_SUBSTEPS, "loop did not yield"
+        time.sleep(engine.timestep * 3)
+
+    engine.update = slow_update
+
+    async def watch():
+        while True:
+            since_yield[0] = 0
+            await asyncio.sleep(0)
+
+    async def run():
+        watcher = asyncio.create_task(watch())
+        task = asyncio.create_task(engine.start())
+        await asyncio.sleep(0.5)
+        engine.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+        watcher.cancel()
+
+    asyncio.run(run())
+
+    assert calls and all(dt == engine.timestep for dt in calls)
@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from quantum_console.simulation._physics_store import _PhysicsStore
+
+
+def props(mass, vx=0.0):
+    # Stands in for PhysicalProperties: the store only reads these fields
+    return SimpleNamespace(
+        mass=mass,
+        velocity=np.array([vx, 0.0, 0.0]),
+        acceleration=np.zeros(3),
+        friction_coefficient=0.3,
+        elasticity=0.8,
+        density=1.0
+    )
+
+
+def test_append_grows_capacity_and_keeps_rows():
+    store = _PhysicsStore(capacity=2)
+
+    assert store.append("a", (1.0, 0.0, 0.0), props(1.0)) is False
+    assert store.append("b", (2.0, 0.0, 0.0), props(2.0)) is False
+    # Third row does not fit: columns are reallocated at double capacity
+    assert store.append("c", (3.0, 0.0, 0.0), props(3.0, vx=5.0)) is True
+
+    assert store.capacity == 4
+    assert len(store) == 3
+    assert store.positions.shape == (3, 3)
+    assert store.positions[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert store.mass.tolist() == [1.0, 2.0, 3.0]
+    assert store.velocities[2].tolist() == [5.0, 0.0, 0.0]
+
+
+def test_remove_swaps_last_row_into_gap():
+    store = _PhysicsStore(capacity=4)
+    for i, name in enumerate("abcd"):
+        store.append(name, (float(i), 0.0, 0.0), props(float(i + 1)))
+
+    assert store.remove("b") == "d"
+
+    assert store.ids == ["a", "d", "c"]
+    assert store.id_to_idx == {"a": 0, "d": 1, "c": 2}
+    assert store.positions[:, 0].tolist() == [0.0, 3.0, 2.0]
+    assert store.mass.tolist() == [1.0, 4.0, 3.0]
+
+
+def test_remove_last_row_moves_nothing():
+    store = _PhysicsStore(capacity=4)
+    store.append("a", (0.0, 0.0, 0.0), props(1.0))
+    store.append("b", (1.0, 0.0, 0.0), props(2.0))
+
+    assert store.remove("b") is None
+    assert store.ids == ["a"]
+    assert store.id_to_idx == {"a": 0}
+    assert len(store.positions) == 1
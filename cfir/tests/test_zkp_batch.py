@@ -0,0 +1,69 @@
+import pytest
+
+from zkp_auth import ProofResponse, RateLimitExceeded, ZeroKnowledgeAuthenticator
+
+IP = "192.168.1.100"
+
+
+def issue(auth, count):
+    challenges = [auth.generate_challenge(IP) for _ in range(count)]
+    proofs = [auth.generate_proof(challenge) for challenge in challenges]
+    return proofs, challenges
+
+
+def test_batch_accepts_valid_proofs_and_consumes_challenges():
+    auth = ZeroKnowledgeAuthenticator("secret", max_attempts=10)
+    proofs, challenges = issue(auth, 3)
+
+    assert auth.verify_proof_batch(proofs, challenges, auth.commitment, IP) == [
+        True, True, True
+    ]
+    assert auth.active_challenges == {}
+
+    # A replayed batch finds no challenges left
+    assert auth.verify_proof_batch(proofs, challenges, auth.commitment, IP) == [
+        False, False, False
+    ]
+
+
+def test_batch_rejects_forged_proof_only():
+    auth = ZeroKnowledgeAuthenticator("secret", max_attempts=10)
+    proofs, challenges = issue(auth, 3)
+    proofs[1] = ProofResponse(
+        proof_hash=b"\0" * 32,
+        nonce=proofs[1].nonce,
+        timestamp=proofs[1].timestamp
+    )
+
+    assert auth.verify_proof_batch(proofs, challenges, auth.commitment, IP) == [
+        True, False, True
+    ]
+    # The forged proof's challenge is still open
+    assert list(auth.active_challenges) == [challenges[1].nonce]
+
+
+def test_batch_rejects_wrong_commitment():
+    auth = ZeroKnowledgeAuthenticator("secret", max_attempts=10)
+    other = ZeroKnowledgeAuthenticator("other", max_attempts=10)
+    proofs, challenges = issue(auth, 2)
+
+    assert auth.verify_proof_batch(proofs, challenges, other.commitment, IP) == [
+        False, False
+    ]
+
+
+def test_batch_over_rate_limit_consumes_nothing():
+    auth = ZeroKnowledgeAuthenticator("secret", max_attempts=3)
+    proofs, challenges = issue(auth, 2)
+
+    with pytest.raises(RateLimitExceeded):
+        auth.verify_proof_batch(proofs, challenges, auth.commitment, IP)
+    assert len(auth.active_challenges) == 2
+
+
+def test_batch_length_mismatch():
+    auth = ZeroKnowledgeAuthenticator("secret", max_attempts=10)
+    proofs, challenges = issue(auth, 2)
+
+    with pytest.raises(ValueError):
+        auth.verify_proof_batch(proofs, challenges[:1], auth.commitment, IP)
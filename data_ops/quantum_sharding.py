@@ -69,8 +69,9 @@ class QuantumSharding:
                 'shard_id': shard_id,
                 'shard_index': shard_index,
                 'total_shards': len(shards),
-                'ciphertext': encrypted_data['ciphertext'],
-                'shared_secret': encrypted_data['shared_secret']
+                'kem_ct': encrypted_data['kem_ct'],
+                'nonce': encrypted_data['nonce'],
+                'ct': encrypted_data['ct']
             })
             
         return encrypted_shards
@@ -135,11 +136,11 @@ class QuantumSharding:
         # Decrypt and combine shards
         decrypted_shards = []
         for shard in collected_shards:
-            decrypted_secret = self.quantum_encryption.decrypt_data(
+            decrypted_payload = self.quantum_encryption.decrypt_payload(
                 private_key, 
-                shard['ciphertext']
+                shard
             )
-            decrypted_shard = base64.b64decode(decrypted_secret).decode('utf-8')
+            decrypted_shard = base64.b64decode(decrypted_payload).decode('utf-8')
             decrypted_shards.append(decrypted_shard)
         
         # Combine shards
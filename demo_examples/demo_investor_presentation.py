@@ -18,8 +18,8 @@ def demo_quantum_encryption():
     # Generate keypair
     keys = QuantumEncryption.generate_kyber_keypair()
     print("Generated Keys:")
-    print(f"Public Key: {keys['public_key'][:32]}...")
-    print(f"Private Key: {keys['private_key'][:32]}...")
+    print(f"Public Key: {QuantumEncryption.serialize_key(keys['public_key'])[:32]}...")
+    print(f"Private Key: {QuantumEncryption.serialize_key(keys['private_key'])[:32]}...")
 
     # Example data to encrypt
     message = "Sensitive quantum data"
@@ -30,12 +30,9 @@ def demo_quantum_encryption():
     print(f"Ciphertext: {encrypted['ciphertext'][:32]}...")
     
     # Decrypt the data
-    decrypted_secret = QuantumEncryption.decrypt_data(
-        keys['private_key'], 
-        encrypted['ciphertext']
-    )
+    decrypted = QuantumEncryption.decrypt_payload(keys['private_key'], encrypted)
     print("\nDecrypted Data:")
-    print(f"Secret: {decrypted_secret[:32]}...")
+    print(f"Message: {decrypted.decode('utf-8')}")
 
 def demo_anomaly_detection():
     """Demonstrate anomaly detection capabilities."""
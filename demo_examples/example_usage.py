@@ -4,8 +4,8 @@ def main():
     # Generate keypair
     keys = QuantumEncryption.generate_kyber_keypair()
     print("Generated Keys:")
-    print(f"Public Key: {keys['public_key'][:32]}...")
-    print(f"Private Key: {keys['private_key'][:32]}...")
+    print(f"Public Key: {QuantumEncryption.serialize_key(keys['public_key'])[:32]}...")
+    print(f"Private Key: {QuantumEncryption.serialize_key(keys['private_key'])[:32]}...")
 
     # Example data to encrypt
     message = "Secret quantum data"
@@ -14,15 +14,11 @@ def main():
     encrypted = QuantumEncryption.encrypt_data(keys['public_key'], message)
     print("\nEncrypted Data:")
     print(f"Ciphertext: {encrypted['ciphertext'][:32]}...")
-    print(f"Shared Secret: {encrypted['shared_secret'][:32]}...")
 
     # Decrypt the data
-    decrypted_secret = QuantumEncryption.decrypt_data(
-        keys['private_key'], 
-        encrypted['ciphertext']
-    )
-    print("\nDecrypted Shared Secret:")
-    print(f"Secret: {decrypted_secret[:32]}...")
+    decrypted = QuantumEncryption.decrypt_payload(keys['private_key'], encrypted)
+    print("\nDecrypted Data:")
+    print(f"Message: {decrypted.decode('utf-8')}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
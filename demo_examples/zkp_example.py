@@ -46,7 +46,7 @@ def demonstrate_successful_auth():
         
         # Get entity's public commitment
         public_commitment = entity.get_public_commitment()
-        print(f"Public Commitment: {public_commitment[:16]}...")
+        print(f"Public Commitment: {public_commitment.hex()[:16]}...")
         
         # Simulate client IP
         client_ip = "192.168.1.100"
@@ -57,7 +57,7 @@ def demonstrate_successful_auth():
         
         # Entity generates proof
         proof = entity.prove_identity(challenge)
-        print(f"Generated Proof: {proof.proof_hash[:16]}...")
+        print(f"Generated Proof: {proof.proof_hash.hex()[:16]}...")
         
         # Verify the proof
         is_valid = verifier.verify_proof(
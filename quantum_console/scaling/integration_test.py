@@ -58,8 +58,6 @@ class ScalingTestHarness:
         
     async def run_load_test(self, duration: int = 300) -> None:
         """Run load test for specified duration."""
-        logger = logging.getLogger("integration_test")
-        logger.setLevel(logging.DEBUG)  # Enable debug logging
         logger.info("Starting load test...")
         
         start_time = datetime.utcnow()
@@ -90,14 +88,15 @@ class ScalingTestHarness:
                 if success:
                     self.stored_data[data_id] = locations
                     self.metrics['successful_operations'] += 1
-                    logger.info(f"Successfully stored data {data_id}")
+                    logger.info("Successfully stored data %s", data_id)
                 else:
                     self.metrics['failed_operations'] += 1
-                    logger.warning(f"Failed to store data {data_id}")
+                    logger.warning("Failed to store data %s", data_id)
                 
                 # Print current metrics after store
-                logger.info(f"After store - Operations: {self.metrics['data_operations']}, "
-                          f"Successes: {self.metrics['successful_operations']}")
+                logger.info("After store - Operations: %d, Successes: %d",
+                            self.metrics['data_operations'],
+                            self.metrics['successful_operations'])
                 
                 # Update visualization after store
                 self._update_visualization(store_latency, 0)
@@ -116,14 +115,15 @@ class ScalingTestHarness:
                     self.metrics['data_operations'] += 1
                     if retrieved_data is not None:
                         self.metrics['successful_operations'] += 1
-                        logger.info(f"Successfully retrieved data {retrieve_id}")
+                        logger.info("Successfully retrieved data %s", retrieve_id)
                     else:
                         self.metrics['failed_operations'] += 1
-                        logger.warning(f"Failed to retrieve data {retrieve_id}")
+                        logger.warning("Failed to retrieve data %s", retrieve_id)
                     
                     # Print current metrics after retrieve
-                    logger.info(f"After retrieve - Operations: {self.metrics['data_operations']}, "
-                              f"Successes: {self.metrics['successful_operations']}")
+                    logger.info("After retrieve - Operations: %d, Successes: %d",
+                                self.metrics['data_operations'],
+                                self.metrics['successful_operations'])
                     
                     # Update visualization after retrieve
                     self._update_visualization(store_latency, retrieve_latency)
@@ -155,7 +155,7 @@ class ScalingTestHarness:
                 max(self.metrics['data_operations'], 1)
             ) * 100
             
-            logger.info(f"Success rate: {success_rate:.2f}%")
+            logger.info("Success rate: %.2f%%", success_rate)
             
             # Update visualization
             self.visualizer.update_metrics({
@@ -1,8 +1,8 @@
 from typing import Dict, List, Set, Optional, Tuple
 import asyncio
+import functools
 import logging
 from datetime import datetime
-from threading import Lock
 import numpy as np
 from dataclasses import dataclass
 import hashlib
@@ -13,6 +13,23 @@ from ..core.quantum_encryption import QuantumEncryption
 from ..models import Entity, Zone
 from ..spatial_auth import SphericalCoordinates
 
+@functools.lru_cache(maxsize=16)
+def _shard_slicer(shard_size: int):
+    """Build a splitter specialized for a fixed shard size.
+    
+    The size is baked into the generated code as a constant, so the hot
+    slicing loop does no attribute or variable lookups for it.
+    """
+    shard_size = int(shard_size)
+    code = (
+        "def slicer(data):\n"
+        f"    return [(i, data[i:i + {shard_size}]) "
+        f"for i in range(0, len(data), {shard_size})]\n"
+    )
+    namespace: Dict = {}
+    exec(code, namespace)
+    return namespace['slicer']
+
 @dataclass
 class ShardConfig:
     """Configuration for shard management."""
@@ -21,8 +38,9 @@ class ShardConfig:
     redundancy_factor: int = 3
     rebalance_threshold: float = 0.2  # 20% imbalance triggers rebalancing
     encryption_strength: str = "kyber1024"  # Post-quantum encryption level
+    simulate_latency: bool = True  # Model one network round trip per retrieval
 
-@dataclass
+@dataclass(slots=True)
 class NodeMetrics:
     """Metrics for a storage node."""
     shard_count: int
@@ -36,16 +54,26 @@ class NodeMetrics:
 class QuantumShardManager:
     """Manages distributed quantum data sharding."""
     
-    def __init__(self, config: ShardConfig):
+    def __init__(
+        self,
+        config: ShardConfig,
+        encryption: Optional[QuantumEncryption] = None
+    ):
         self.config = config
         self.nodes: Dict[str, NodeMetrics] = {}
         self.shards: Dict[str, Dict] = {}
         self.node_shards: Dict[str, Set[str]] = {}
-        self._lock = Lock()
+        # Held across awaits, so it must never block the event loop
+        self._lock = asyncio.Lock()
+        self._rebalance_pending: Optional[asyncio.Task] = None
+        # Old location -> new location for shards moved by a rebalance,
+        # so locations handed out by store_data stay retrievable
+        self._relocated: Dict[str, str] = {}
         self.logger = logging.getLogger("shard_manager")
         
-        # Initialize encryption
-        self.encryption = QuantumEncryption()
+        # Initialize encryption; a shared instance may be passed in so
+        # several managers reuse one long-lived context
+        self.encryption = encryption or QuantumEncryption()
         
         # Metrics
         self.metrics = {
@@ -74,7 +102,7 @@ class QuantumShardManager:
                 )
                 self.node_shards[node_id] = set()
                 
-            self.logger.info(f"Initialized {len(self.nodes)} nodes")
+            self.logger.info("Initialized %d nodes", len(self.nodes))
             
         except Exception as e:
             self.logger.error(f"Failed to initialize nodes: {str(e)}")
@@ -86,7 +114,7 @@ class QuantumShardManager:
         capacity: int
     ) -> bool:
         """Add a new storage node."""
-        with self._lock:
+        async with self._lock:
             try:
                 if node_id in self.nodes:
                     return False
@@ -103,20 +131,36 @@ class QuantumShardManager:
                 
                 self.node_shards[node_id] = set()
                 
-                # Trigger rebalancing if needed
-                if len(self.nodes) > 1:
-                    await self._rebalance_shards()
+                # Schedule a debounced rebalance; adds arriving within the
+                # quiet period share a single pass
+                if len(self.nodes) > 1 and self._rebalance_pending is None:
+                    self._rebalance_pending = asyncio.create_task(
+                        self._rebalance_after(0.5)
+                    )
                     
-                self.logger.info(f"Added node {node_id} with capacity {capacity}")
+                self.logger.info("Added node %s with capacity %d", node_id, capacity)
                 return True
                 
             except Exception as e:
                 self.logger.error(f"Failed to add node {node_id}: {str(e)}")
                 return False
                 
+    async def _rebalance_after(self, delay: float) -> None:
+        """Run a single rebalance once node additions have settled."""
+        try:
+            await asyncio.sleep(delay)
+            async with self._lock:
+                await self._rebalance_shards()
+                
+        except Exception as e:
+            self.logger.error(f"Failed to rebalance shards: {str(e)}")
+            
+        finally:
+            self._rebalance_pending = None
+                
     async def remove_node(self, node_id: str) -> bool:
         """Remove a storage node."""
-        with self._lock:
+        async with self._lock:
             try:
                 if node_id not in self.nodes:
                     return False
@@ -128,7 +172,7 @@ class QuantumShardManager:
                 del self.nodes[node_id]
                 del self.node_shards[node_id]
                 
-                self.logger.info(f"Removed node {node_id}")
+                self.logger.info("Removed node %s", node_id)
                 return True
                 
             except Exception as e:
@@ -145,18 +189,18 @@ class QuantumShardManager:
             # Generate shards
             shards = self._create_shards(data)
             
-            # Encrypt shards
-            encrypted_shards = []
-            for shard in shards:
-                keys = self.encryption.generate_kyber_keypair()
-                encrypted = self.encryption.encrypt_data(
-                    keys['public_key'],
-                    shard
+            # Encrypt each shard under its own keypair, so one leaked
+            # private key exposes a single shard; only the encryption
+            # context is shared
+            encrypted_shards = [
+                self._encrypt_one(
+                    self.encryption.generate_kyber_keypair(),
+                    offset,
+                    shard,
+                    len(data)
                 )
-                encrypted_shards.append({
-                    'data': encrypted,  # Now a base64 string
-                    'key': keys['private_key']  # base64 string
-                })
+                for offset, shard in shards
+            ]
             
             # Distribute shards
             shard_locations = await self._distribute_shards(
@@ -180,12 +224,16 @@ class QuantumShardManager:
     ) -> Optional[bytes]:
         """Retrieve and reconstruct data from shards."""
         try:
-            # Collect shards
-            shards = []
-            for location in shard_locations:
-                shard = await self._retrieve_shard(data_id, location)
-                if shard:
-                    shards.append(shard)
+            # Simulate network latency once for the whole batch
+            if self.config.simulate_latency:
+                await asyncio.sleep(0.01)
+                
+            # Collect shards concurrently
+            results = await asyncio.gather(*[
+                self._retrieve_shard(data_id, location)
+                for location in shard_locations
+            ])
+            shards = [shard for shard in results if shard]
                     
             if len(shards) < len(shard_locations):
                 self.logger.error(
@@ -201,8 +249,24 @@ class QuantumShardManager:
             self.logger.error(f"Failed to retrieve data {data_id}: {str(e)}")
             return None 
 
-    def _create_shards(self, data: bytes) -> List[bytes]:
-        """Split data into shards."""
+    def _encrypt_one(
+        self,
+        keys: Dict[str, bytes],
+        offset: int,
+        shard: bytes,
+        total_size: int
+    ) -> Dict:
+        """Encrypt a single shard with its own keypair."""
+        encrypted = self.encryption.encrypt_data(keys['public_key'], shard)
+        return {
+            'data': encrypted,  # kem_ct / nonce / ct from encrypt_data
+            'key': keys['private_key'],  # raw bytes
+            'offset': offset,  # Position of the shard in the original data
+            'total_size': total_size
+        }
+
+    def _create_shards(self, data: bytes) -> List[Tuple[int, bytes]]:
+        """Split data into (offset, shard) pairs."""
         try:
             # Calculate optimal shard size
             total_size = len(data)
@@ -219,15 +283,14 @@ class QuantumShardManager:
             # Ensure shard size is at least 1 byte
             shard_size = max(shard_size, 1)
             
-            # Split data into shards
-            shards = []
-            for i in range(0, total_size, shard_size):
-                shard = data[i:i + shard_size]
-                shards.append(shard)
+            # Split data into shards; shard sizes repeat for a given
+            # cluster topology, so the specialized slicer is cached
+            shards = _shard_slicer(shard_size)(data)
                 
-            # Ensure minimum number of shards for redundancy
+            # Ensure minimum number of shards for redundancy; copies keep
+            # the offset of the shard they duplicate
             while len(shards) < self.config.redundancy_factor:
-                shards.append(shards[-1] if shards else b'')  # Handle empty data case
+                shards.append(shards[-1] if shards else (0, b''))  # Handle empty data case
                 
             return shards
             
@@ -261,10 +324,11 @@ class QuantumShardManager:
                 
                 # Update node metrics
                 self.nodes[node_id].shard_count += 1
-                self.nodes[node_id].storage_used += len(shard['data'])
+                self.nodes[node_id].storage_used += len(shard['data']['ct'])
                 
                 # Track shard
                 self.shards[location] = shard
+                self._relocated.pop(location, None)
                 self.node_shards[node_id].add(location)
                 
             return shard_locations
@@ -280,6 +344,9 @@ class QuantumShardManager:
     ) -> Optional[bytes]:
         """Retrieve a shard from a node."""
         try:
+            # Follow any moves made by rebalancing
+            while location in self._relocated:
+                location = self._relocated[location]
             node_id, shard_idx = location.split(':')
             
             if node_id not in self.nodes:
@@ -289,12 +356,7 @@ class QuantumShardManager:
                 raise ValueError(f"Shard {location} not found")
                 
             # Get encrypted shard
-            encrypted_shard = self.shards[location]
-            
-            # Simulate network latency
-            await asyncio.sleep(0.01)
-            
-            return encrypted_shard
+            return self.shards[location]
             
         except Exception as e:
             self.logger.error(f"Failed to retrieve shard: {str(e)}")
@@ -338,7 +400,7 @@ class QuantumShardManager:
                 
                 # Update metrics
                 self.nodes[new_node].shard_count += 1
-                self.nodes[new_node].storage_used += len(shard['data'])
+                self.nodes[new_node].storage_used += len(shard['data']['ct'])
                 
             self.metrics['rebalance_operations'] += 1
             
@@ -346,19 +408,91 @@ class QuantumShardManager:
             self.logger.error(f"Failed to redistribute shards: {str(e)}")
             raise 
 
+    async def _rebalance_shards(self) -> None:
+        """Move shards from the fullest to the emptiest nodes.
+        
+        Runs until the spread in shard counts is within
+        rebalance_threshold of the mean (and at most one shard).
+        """
+        try:
+            if len(self.nodes) < 2:
+                return
+                
+            counts = {
+                node_id: len(self.node_shards[node_id])
+                for node_id in self.nodes
+            }
+            mean = sum(counts.values()) / len(counts)
+            tolerance = max(1.0, self.config.rebalance_threshold * mean)
+            
+            moved = 0
+            for _ in range(sum(counts.values())):
+                src = max(counts, key=counts.get)
+                dst = min(counts, key=counts.get)
+                if counts[src] - counts[dst] <= tolerance:
+                    break
+                    
+                # Any shard whose index is free on the destination node
+                location = next(
+                    (
+                        loc for loc in self.node_shards[src]
+                        if f"{dst}:{loc.split(':')[1]}" not in self.shards
+                    ),
+                    None
+                )
+                if location is None:
+                    break
+                    
+                self._move_shard(location, dst)
+                counts[src] -= 1
+                counts[dst] += 1
+                moved += 1
+                
+            if moved:
+                self.metrics['rebalance_operations'] += 1
+                self.logger.info("Rebalanced %d shards", moved)
+                
+        except Exception as e:
+            self.logger.error(f"Failed to rebalance shards: {str(e)}")
+            raise
+            
+    def _move_shard(self, location: str, new_node: str) -> str:
+        """Move one shard to another node, keeping its index."""
+        old_node, shard_idx = location.split(':')
+        new_location = f"{new_node}:{shard_idx}"
+        shard = self.shards.pop(location)
+        size = len(shard['data']['ct'])
+        
+        self.shards[new_location] = shard
+        # new_location is live again; dropping any stale forward keeps
+        # the relocation map free of cycles
+        self._relocated.pop(new_location, None)
+        self._relocated[location] = new_location
+        self.node_shards[old_node].discard(location)
+        self.node_shards[new_node].add(new_location)
+        
+        self.nodes[old_node].shard_count -= 1
+        self.nodes[old_node].storage_used -= size
+        self.nodes[new_node].shard_count += 1
+        self.nodes[new_node].storage_used += size
+        return new_location
+
     def _reconstruct_data(self, encrypted_shards: List[Dict[str, str]]) -> bytes:
         """Reconstruct original data from shards."""
         try:
             # Decrypt shards
             decrypted_shards = []
+            placed = True
             for shard in encrypted_shards:
                 try:
                     # Decrypt using private key
-                    decrypted = self.encryption.decrypt_data(
-                        shard['key'],  # base64 string
-                        shard['data']  # base64 string
+                    decrypted = self.encryption.decrypt_payload(
+                        shard['key'],  # raw bytes
+                        shard['data']
                     )
-                    decrypted_shards.append(base64.b64decode(decrypted))
+                    offset = shard.get('offset')
+                    placed = placed and offset is not None
+                    decrypted_shards.append((offset, decrypted))
                 except Exception as e:
                     self.logger.error(f"Failed to decrypt shard: {str(e)}")
                     continue
@@ -366,9 +500,23 @@ class QuantumShardManager:
             if not decrypted_shards:
                 raise ValueError("No shards could be decrypted")
             
-            # Combine shards
-            # Remove duplicates (from redundancy)
-            unique_shards = list(dict.fromkeys(decrypted_shards))
+            if placed:
+                # Copy each shard to its recorded offset; redundant copies
+                # land on the same range, so no dedup pass is needed
+                buffer = bytearray(encrypted_shards[0]['total_size'])
+                for offset, shard in decrypted_shards:
+                    buffer[offset:offset + len(shard)] = shard
+                return bytes(buffer)
+            
+            # Shards without offset metadata: remove duplicates (from
+            # redundancy) by digest rather than hashing full contents
+            seen = set()
+            unique_shards = []
+            for _, shard in decrypted_shards:
+                digest = hashlib.blake2b(shard, digest_size=8).digest()
+                if digest not in seen:
+                    seen.add(digest)
+                    unique_shards.append(shard)
             
             # Concatenate in order
             reconstructed_data = b''.join(unique_shards)
@@ -0,0 +1,143 @@
+"""
+Numba kernels for the simulation hot paths.
+"""
+
+import math
+from numba import njit, prange
+
+@njit(cache=True, fastmath=True, parallel=True)
+def sph2cart(r, theta, phi, out):
+    """Convert 1-D (r, theta, phi) arrays into (N,3) cartesian rows of out.
+    
+    Follows SphericalCoordinates: theta is the polar angle from +z and
+    phi the azimuth in the x-y plane.
+    """
+    for i in prange(r.shape[0]):
+        st = math.sin(theta[i])
+        out[i, 0] = r[i] * st * math.cos(phi[i])
+        out[i, 1] = r[i] * st * math.sin(phi[i])
+        out[i, 2] = r[i] * math.cos(theta[i])
+    return out
+
+@njit(cache=True, fastmath=True, parallel=True)
+def cart2sph(positions, out):
+    """Convert (N,3) cartesian rows into (N,3) (r, theta, phi) rows of out."""
+    for i in prange(positions.shape[0]):
+        x = positions[i, 0]
+        y = positions[i, 1]
+        z = positions[i, 2]
+        r = math.sqrt(x * x + y * y + z * z)
+        out[i, 0] = r
+        if r > 0.0:
+            out[i, 1] = math.acos(min(1.0, max(-1.0, z / r)))
+            out[i, 2] = math.atan2(y, x)
+        else:
+            out[i, 1] = 0.0
+            out[i, 2] = 0.0
+    return out
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _calculate_new_position(x, y, z, vx, vy, vz, dt):
+    """Advance one position by its already-updated velocity."""
+    return x + vx * dt, y + vy * dt, z + vz * dt
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _apply_friction(vx, vy, vz, mu, dt):
+    """Damp one velocity by a friction coefficient."""
+    damping = max(0.0, 1.0 - mu * dt)
+    return vx * damping, vy * damping, vz * damping
+
+@njit(parallel=True, fastmath=True, nogil=True, cache=True, error_model='numpy')
+def _step_kernel(positions, velocities, accelerations, masses, friction,
+                 zone_ids, zone_gravity, zone_air_density, zone_wind, dt):
+    """Run one physics tick over every row in place.
+    
+    The first loop accumulates forces, the second integrates with
+    semi-implicit Euler: velocity is updated first and the new velocity
+    moves the position. Collisions are resolved separately afterwards.
+    A zone id of -1 means the row lies outside every zone and feels no
+    environmental forces.
+    """
+    n = positions.shape[0]
+    
+    for i in prange(n):
+        zone = zone_ids[i]
+        if zone < 0:
+            for k in range(3):
+                accelerations[i, k] = 0.0
+            continue
+        drag = -0.5 * zone_air_density[zone] / masses[i]
+        for k in range(3):
+            v = velocities[i, k]
+            accelerations[i, k] = drag * v * abs(v) + 0.1 * (zone_wind[zone, k] - v)
+        accelerations[i, 1] -= zone_gravity[zone]
+        
+    for i in prange(n):
+        vx, vy, vz = _apply_friction(
+            velocities[i, 0] + accelerations[i, 0] * dt,
+            velocities[i, 1] + accelerations[i, 1] * dt,
+            velocities[i, 2] + accelerations[i, 2] * dt,
+            friction[i], dt
+        )
+        velocities[i, 0] = vx
+        velocities[i, 1] = vy
+        velocities[i, 2] = vz
+        
+        x, y, z = _calculate_new_position(
+            positions[i, 0], positions[i, 1], positions[i, 2],
+            vx, vy, vz, dt
+        )
+        positions[i, 0] = x
+        positions[i, 1] = y
+        positions[i, 2] = z
+
+@njit(nogil=True, fastmath=True, cache=True)
+def _resolve_pairs(pair_i, pair_j, start, end, positions, velocities,
+                   masses, elasticity, out_dv):
+    """Accumulate elastic impulses for pairs[start:end] into out_dv.
+    
+    Only reads the shared state, so disjoint pair ranges can run on
+    separate threads, each with its own out_dv scratch buffer.
+    """
+    for p in range(start, end):
+        a = pair_i[p]
+        b = pair_j[p]
+        nx = positions[a, 0] - positions[b, 0]
+        ny = positions[a, 1] - positions[b, 1]
+        nz = positions[a, 2] - positions[b, 2]
+        distance = math.sqrt(nx * nx + ny * ny + nz * nz)
+        if distance == 0.0:
+            continue
+        nx /= distance
+        ny /= distance
+        nz /= distance
+        
+        # Only pairs moving towards each other exchange momentum
+        approach = (
+            (velocities[a, 0] - velocities[b, 0]) * nx
+            + (velocities[a, 1] - velocities[b, 1]) * ny
+            + (velocities[a, 2] - velocities[b, 2]) * nz
+        )
+        if approach >= 0.0:
+            continue
+            
+        e = min(elasticity[a], elasticity[b])
+        impulse = -(1.0 + e) * approach / (1.0 / masses[a] + 1.0 / masses[b])
+        ja = impulse / masses[a]
+        jb = impulse / masses[b]
+        out_dv[a, 0] += ja * nx
+        out_dv[a, 1] += ja * ny
+        out_dv[a, 2] += ja * nz
+        out_dv[b, 0] -= jb * nx
+        out_dv[b, 1] -= jb * ny
+        out_dv[b, 2] -= jb * nz
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _utility_step(load, capacity, efficiency, noise):
+    """Random-walk every utility load and refresh its efficiency in place."""
+    for i in prange(load.shape[0]):
+        current = min(capacity[i], max(0.0, load[i] + noise[i]))
+        load[i] = current
+        load_factor = current / capacity[i]
+        efficiency[i] = 1.0 - load_factor * load_factor * 0.2
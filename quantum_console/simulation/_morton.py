@@ -0,0 +1,38 @@
+"""
+Morton (Z-order) codes for spatially sorting simulation state.
+"""
+
+import numpy as np
+from numba import njit
+
+_AXIS_MASK = np.uint64(0x1fffff)  # 21 bits per axis
+
+@njit(cache=True, inline='always')
+def _expand_bits(v):
+    """Spread the low 21 bits of v so two zero bits follow each one."""
+    v &= _AXIS_MASK
+    v = (v | (v << np.uint64(32))) & np.uint64(0x1f00000000ffff)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x1f0000ff0000ff)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x100f00f00f00f00f)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x10c30c30c30c30c3)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x1249249249249249)
+    return v
+
+@njit(cache=True)
+def morton_encode_3d(xi, yi, zi):
+    """Interleave per-axis integer cells into 63-bit Morton codes."""
+    codes = np.empty(xi.shape[0], dtype=np.uint64)
+    for i in range(xi.shape[0]):
+        codes[i] = (
+            _expand_bits(np.uint64(xi[i]))
+            | (_expand_bits(np.uint64(yi[i])) << np.uint64(1))
+            | (_expand_bits(np.uint64(zi[i])) << np.uint64(2))
+        )
+    return codes
+
+def morton_order(positions: np.ndarray, cell: float) -> np.ndarray:
+    """Get the row order that sorts (N,3) positions along the Z-curve."""
+    cells = np.floor((positions - positions.min(axis=0)) / cell)
+    cells = np.clip(cells, 0, int(_AXIS_MASK)).astype(np.uint32)
+    codes = morton_encode_3d(cells[:, 0], cells[:, 1], cells[:, 2])
+    return np.argsort(codes, kind='stable')
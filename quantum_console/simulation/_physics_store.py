@@ -0,0 +1,122 @@
+"""
+Structure-of-arrays entity state for the physics engine.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple, Optional, TYPE_CHECKING
+from dataclasses import dataclass, field
+
+if TYPE_CHECKING:
+    from .physics_engine import PhysicalProperties
+
+@dataclass
+class _PhysicsStore:
+    """Structure-of-arrays entity state, one row per entity.
+    
+    Columns are allocated with spare capacity that doubles when full, and
+    removal swaps the last row into the gap, so rows stay contiguous.
+    The accessors return views of the live rows only.
+    """
+    capacity: int = 64
+    ids: List[str] = field(default_factory=list)
+    id_to_idx: Dict[str, int] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        self._positions = np.zeros((self.capacity, 3))
+        self._velocities = np.zeros((self.capacity, 3))
+        self._accelerations = np.zeros((self.capacity, 3))
+        self._mass = np.ones(self.capacity)
+        self._friction = np.zeros(self.capacity)
+        self._elasticity = np.zeros(self.capacity)
+        self._density = np.ones(self.capacity)
+        
+    def __len__(self) -> int:
+        return len(self.ids)
+        
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[:len(self.ids)]
+        
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._velocities[:len(self.ids)]
+        
+    @property
+    def accelerations(self) -> np.ndarray:
+        return self._accelerations[:len(self.ids)]
+        
+    @property
+    def mass(self) -> np.ndarray:
+        return self._mass[:len(self.ids)]
+        
+    @property
+    def friction(self) -> np.ndarray:
+        return self._friction[:len(self.ids)]
+        
+    @property
+    def elasticity(self) -> np.ndarray:
+        return self._elasticity[:len(self.ids)]
+        
+    @property
+    def density(self) -> np.ndarray:
+        return self._density[:len(self.ids)]
+        
+    def append(self,
+               entity_id: str,
+               position: Tuple[float, float, float],
+               properties: 'PhysicalProperties') -> bool:
+        """Add a row; returns True if the columns were reallocated."""
+        row = len(self.ids)
+        grown = row == self.capacity
+        if grown:
+            self._grow(2 * self.capacity)
+            
+        self._positions[row] = position
+        self._velocities[row] = properties.velocity
+        self._accelerations[row] = properties.acceleration
+        self._mass[row] = properties.mass
+        self._friction[row] = properties.friction_coefficient
+        self._elasticity[row] = properties.elasticity
+        self._density[row] = properties.density
+        self.id_to_idx[entity_id] = row
+        self.ids.append(entity_id)
+        return grown
+        
+    def remove(self, entity_id: str) -> Optional[str]:
+        """Swap-and-pop a row; returns the id moved into its place, if any."""
+        row = self.id_to_idx.pop(entity_id)
+        last = len(self.ids) - 1
+        moved = None
+        if row != last:
+            for column in self._columns():
+                column[row] = column[last]
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self.id_to_idx[moved] = row
+        self.ids.pop()
+        return moved
+        
+    def reorder(self, order: np.ndarray) -> None:
+        """Permute every row so the old row order[k] becomes row k."""
+        size = len(self.ids)
+        for column in self._columns():
+            column[:size] = column[:size][order]
+        self.ids = [self.ids[k] for k in order]
+        self.id_to_idx = {entity_id: k for k, entity_id in enumerate(self.ids)}
+        
+    def _columns(self) -> List[np.ndarray]:
+        return [
+            self._positions, self._velocities, self._accelerations,
+            self._mass, self._friction, self._elasticity, self._density
+        ]
+        
+    def _grow(self, capacity: int) -> None:
+        """Reallocate every column with room for capacity rows."""
+        size = len(self.ids)
+        for name in ('_positions', '_velocities', '_accelerations',
+                     '_mass', '_friction', '_elasticity', '_density'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:])
+            new[:size] = old[:size]
+            setattr(self, name, new)
+        self.capacity = capacity
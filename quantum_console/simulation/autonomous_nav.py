@@ -1,14 +1,24 @@
 from dataclasses import dataclass
-from typing import List, Set, Dict, Optional
+from typing import List, Set, Dict, Optional, Tuple
 import numpy as np
 import logging
+import math
+from collections import deque
 from datetime import datetime
 from threading import Lock
+from time import monotonic_ns
+from numba import njit
 
 from ..models import Entity, Zone
+from .physics_engine import coordinates_to_cartesian
 from ..spatial_auth import SphericalCoordinates
 from quantum_console.spatial_auth.anomaly_detection import IntrusionDetector
 
+@njit(cache=True)
+def _norm3_sq(v):
+    """Squared length of a 3-vector."""
+    return v[0] * v[0] + v[1] * v[1] + v[2] * v[2]
+
 @dataclass
 class NavigationState:
     """Current state of an autonomous vehicle."""
@@ -17,7 +27,14 @@ class NavigationState:
     heading: float
     collision_risk: float
     route_efficiency: float
-    last_update: datetime
+    last_update_ns: int  # time.monotonic_ns() of the last update
+
+@dataclass
+class RiskReport:
+    """Collision risks for one scan, with their maximum."""
+    entity_ids: List[str]
+    risks: np.ndarray  # parallel to entity_ids
+    max_risk: float = 0.0
 
 class AutonomousVehicle(Entity):
     """Represents an autonomous vehicle in the system."""
@@ -38,13 +55,23 @@ class AutonomousVehicle(Entity):
         self.vehicle_id = vehicle_id
         self.max_velocity = max_velocity
         self.sensor_range = sensor_range
-        self.state = NavigationState(
+        # Double-buffered navigation state: readers see the front
+        # buffer, update() stages the next state and swaps references
+        self._state_front = NavigationState(
             position=initial_position,
             velocity=np.zeros(3),
             heading=0.0,
             collision_risk=0.0,
             route_efficiency=1.0,
-            last_update=datetime.utcnow()
+            last_update_ns=monotonic_ns()
+        )
+        self._state_back = NavigationState(
+            position=initial_position,
+            velocity=np.zeros(3),
+            heading=0.0,
+            collision_risk=0.0,
+            route_efficiency=1.0,
+            last_update_ns=self._state_front.last_update_ns
         )
         
         # Navigation components
@@ -52,55 +79,75 @@ class AutonomousVehicle(Entity):
         self.collision_detector = CollisionDetector(self)
         self.motion_controller = MotionController(self)
         
-        # Thread safety
-        self._state_lock = Lock()
+        # Per-tick spatial index and metrics buffer shared by the
+        # simulation manager
+        self.spatial_index = None
+        self.metrics_buffer: Optional[deque] = None
         
         # Logging
         self.logger = logging.getLogger(f"av_{vehicle_id}")
         
+    @property
+    def state(self) -> NavigationState:
+        """Current published navigation state."""
+        return self._state_front
+        
     def update(self, delta_time: float) -> None:
-        """Update vehicle state."""
-        with self._state_lock:
-            try:
-                # Check surroundings
-                nearby_entities = self.scan_environment()
-                collision_risks = self.collision_detector.assess_risks(
-                    nearby_entities
-                )
-                
-                # Update route if needed
-                if self.route_planner.should_replan(collision_risks):
-                    self.route_planner.replan_route(nearby_entities)
-                
-                # Update motion
-                new_state = self.motion_controller.compute_next_state(
-                    self.state,
-                    collision_risks,
-                    delta_time
-                )
-                
-                # Update state
-                self.state = new_state
-                self.coordinates = new_state.position
-                
-                # Log metrics
-                self._log_metrics()
-                
-            except Exception as e:
-                self.logger.error(f"Vehicle update failed: {str(e)}")
-                raise
-                
+        """Update vehicle state.
+        
+        Not locked: the simulation manager is the single writer, and the
+        new state is published with one reference swap, which is atomic
+        under the GIL.
+        """
+        try:
+            # Check surroundings
+            nearby_entities = self.scan_environment()
+            collision_risks = self.collision_detector.assess_risks(
+                nearby_entities
+            )
+            
+            # Update route if needed
+            if self.route_planner.should_replan(collision_risks):
+                self.route_planner.replan_route(nearby_entities)
+            
+            # Stage the next state in the back buffer, then swap
+            next_state = self.motion_controller.compute_next_state(
+                self._state_front,
+                collision_risks,
+                delta_time,
+                out=self._state_back
+            )
+            if next_state is self._state_back:
+                self._state_back = self._state_front
+                self._state_front = next_state
+            self.coordinates = self._state_front.position
+            
+            # Log metrics
+            self._log_metrics()
+            
+        except Exception as e:
+            self.logger.error(f"Vehicle update failed: {str(e)}")
+            raise
+            
     def scan_environment(self) -> List[Entity]:
         """Scan for nearby entities."""
         try:
-            nearby = self.horizon.get_nearby_receptors(
-                self.coordinates,
-                max_distance=self.sensor_range
-            )
+            if self.spatial_index is not None:
+                nearby = self.spatial_index.query(
+                    self.coordinates,
+                    self.sensor_range
+                )
+            else:
+                nearby = self.horizon.get_nearby_receptors(
+                    self.coordinates,
+                    max_distance=self.sensor_range
+                )
             
             # Filter and validate entities
             valid_entities = []
             for entity in nearby:
+                if entity is self:
+                    continue
                 if self.can_access_data(entity.coordinates):
                     valid_entities.append(entity)
                     
@@ -112,6 +159,21 @@ class AutonomousVehicle(Entity):
             
     def _log_metrics(self) -> None:
         """Log vehicle metrics."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+            
+        # Defer dict building and formatting to the manager's flush
+        if self.metrics_buffer is not None:
+            self.metrics_buffer.append((
+                self.vehicle_id,
+                self.state.position,
+                self.state.velocity.copy(),
+                self.state.collision_risk,
+                self.state.route_efficiency,
+                datetime.utcnow()
+            ))
+            return
+            
         metrics = {
             'vehicle_id': self.vehicle_id,
             'position': self.state.position.to_dict(),
@@ -120,7 +182,7 @@ class AutonomousVehicle(Entity):
             'route_efficiency': self.state.route_efficiency,
             'timestamp': datetime.utcnow().isoformat()
         }
-        self.logger.info(f"Vehicle metrics: {metrics}")
+        self.logger.info("Vehicle metrics: %s", metrics)
 
 class RoutePlanner:
     """Plans and optimizes vehicle routes."""
@@ -128,20 +190,20 @@ class RoutePlanner:
     def __init__(self, vehicle: AutonomousVehicle):
         self.vehicle = vehicle
         self.current_route: List[SphericalCoordinates] = []
-        self.last_replan: datetime = datetime.utcnow()
+        self.last_replan_ns: int = monotonic_ns()
         self.replan_interval: float = 1.0  # seconds
         self._lock = Lock()
         
-    def should_replan(self, collision_risks: Dict[str, float]) -> bool:
+    def should_replan(self, collision_risks: RiskReport) -> bool:
         """Determine if route should be replanned."""
         if not self.current_route:
             return True
             
-        now = datetime.utcnow()
-        if (now - self.last_replan).total_seconds() > self.replan_interval:
+        elapsed_ns = monotonic_ns() - self.last_replan_ns
+        if elapsed_ns > self.replan_interval * 1e9:
             return True
             
-        return max(collision_risks.values(), default=0) > 0.5
+        return collision_risks.max_risk > 0.5
         
     def replan_route(
         self,
@@ -153,7 +215,7 @@ class RoutePlanner:
                 # Implement A* or similar algorithm here
                 # This is a simplified placeholder
                 self.current_route = self._compute_safe_route(nearby_entities)
-                self.last_replan = datetime.utcnow()
+                self.last_replan_ns = monotonic_ns()
                 return self.current_route
                 
             except Exception as e:
@@ -171,26 +233,45 @@ class CollisionDetector:
     def assess_risks(
         self,
         nearby_entities: List[Entity]
-    ) -> Dict[str, float]:
-        """Assess collision risks with nearby entities."""
-        risks = {}
+    ) -> RiskReport:
+        """Assess collision risks with nearby entities.
         
-        for entity in nearby_entities:
+        The maximum risk is tracked in the same pass so callers never
+        have to rescan the scores.
+        """
+        # Cheap squared-distance check for every entity before any TTC math
+        positions = coordinates_to_cartesian(
+            [entity.coordinates for entity in nearby_entities]
+        )
+        offsets = positions - self.vehicle.coordinates.to_cartesian()
+        in_range = np.einsum('ij,ij->i', offsets, offsets) <= self.vehicle.sensor_range ** 2
+        entity_ids: List[str] = []
+        risks = np.empty(len(nearby_entities))
+        max_risk = 0.0
+        
+        for entity, near in zip(nearby_entities, in_range):
+            if not near:
+                continue
+                
             try:
                 # Calculate time to collision
                 ttc = self._compute_time_to_collision(entity)
                 
                 # Convert to risk score (0-1)
                 risk = 1.0 / (1.0 + ttc) if ttc > 0 else 1.0
-                risks[entity.entity_id] = risk
                 
             except Exception as e:
                 self.vehicle.logger.error(
                     f"Risk assessment failed for {entity.entity_id}: {str(e)}"
                 )
-                risks[entity.entity_id] = 1.0  # Assume maximum risk on error
+                risk = 1.0  # Assume maximum risk on error
                 
-        return risks
+            risks[len(entity_ids)] = risk
+            entity_ids.append(entity.entity_id)
+            if risk > max_risk:
+                max_risk = risk
+                
+        return RiskReport(entity_ids, risks[:len(entity_ids)], max_risk)
 
 class MotionController:
     """Controls vehicle motion and dynamics."""
@@ -203,11 +284,26 @@ class MotionController:
     def compute_next_state(
         self,
         current_state: NavigationState,
-        collision_risks: Dict[str, float],
-        delta_time: float
+        collision_risks: RiskReport,
+        delta_time: float,
+        out: Optional[NavigationState] = None
     ) -> NavigationState:
-        """Compute next vehicle state."""
+        """Compute next vehicle state.
+        
+        When out is given (and is not current_state) it is updated in
+        place and returned, reusing its velocity array.
+        """
         try:
+            if out is None:
+                out = NavigationState(
+                    position=current_state.position,
+                    velocity=np.zeros(3),
+                    heading=current_state.heading,
+                    collision_risk=current_state.collision_risk,
+                    route_efficiency=current_state.route_efficiency,
+                    last_update_ns=current_state.last_update_ns
+                )
+                
             # Compute desired acceleration
             desired_accel = self._compute_desired_acceleration(
                 current_state,
@@ -215,12 +311,14 @@ class MotionController:
             )
             
             # Update velocity
-            new_velocity = current_state.velocity + desired_accel * delta_time
+            new_velocity = out.velocity
+            np.multiply(desired_accel, delta_time, out=new_velocity)
+            new_velocity += current_state.velocity
             
-            # Enforce speed limit
-            speed = np.linalg.norm(new_velocity)
-            if speed > self.vehicle.max_velocity:
-                new_velocity *= self.vehicle.max_velocity / speed
+            # Enforce speed limit; the sqrt is only taken when clamping
+            speed_sq = _norm3_sq(new_velocity)
+            if speed_sq > self.vehicle.max_velocity ** 2:
+                new_velocity *= self.vehicle.max_velocity / math.sqrt(speed_sq)
             
             # Update position
             new_position = self._update_position(
@@ -229,14 +327,12 @@ class MotionController:
                 delta_time
             )
             
-            return NavigationState(
-                position=new_position,
-                velocity=new_velocity,
-                heading=self._compute_heading(new_velocity),
-                collision_risk=max(collision_risks.values(), default=0),
-                route_efficiency=self._compute_efficiency(new_position),
-                last_update=datetime.utcnow()
-            )
+            out.position = new_position
+            out.heading = self._compute_heading(new_velocity)
+            out.collision_risk = collision_risks.max_risk
+            out.route_efficiency = self._compute_efficiency(new_position)
+            out.last_update_ns = monotonic_ns()
+            return out
             
         except Exception as e:
             self.vehicle.logger.error(f"Motion update failed: {str(e)}")
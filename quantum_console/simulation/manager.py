@@ -1,13 +1,18 @@
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 import asyncio
 import logging
+import math
+from collections import deque
 from datetime import datetime
 from threading import Lock
+from time import monotonic_ns
 import numpy as np
 from dataclasses import dataclass
+from scipy.spatial import cKDTree
 
 from .autonomous_nav import AutonomousVehicle
-from .smart_city import TrafficLight, SmartUtility
+from .physics_engine import coordinates_to_cartesian
+from .smart_city import IoTSensor, TrafficLight, SmartUtility, SmartUtilityManager
 from cfir.entities import Entity, Zone
 from ..spatial_auth import SphericalCoordinates
 
@@ -22,6 +27,25 @@ class SimulationConfig:
     max_velocity: float = 30.0  # m/s
     sensor_range: float = 100.0  # meters
 
+class SpatialIndex:
+    """KD-tree over entity positions, rebuilt once per simulation tick."""
+    
+    def __init__(self, entities: List[Entity]):
+        self.entities = entities
+        positions = coordinates_to_cartesian(
+            [entity.coordinates for entity in entities]
+        )
+        self.tree = cKDTree(positions)
+        
+    def query(
+        self,
+        position: SphericalCoordinates,
+        radius: float
+    ) -> List[Entity]:
+        """Get all entities within radius of a position."""
+        indices = self.tree.query_ball_point(position.to_cartesian(), r=radius)
+        return [self.entities[i] for i in indices]
+
 class SimulationManager:
     """Manages real-world simulation scenarios."""
     
@@ -30,9 +54,24 @@ class SimulationManager:
         self.entities: Dict[str, Entity] = {}
         self.zones: Dict[str, Zone] = {}
         self.running = False
+        
+        # Entities bucketed by type at creation, so ticks skip isinstance
+        self._vehicles: List[AutonomousVehicle] = []
+        self._lights: List[TrafficLight] = []
+        self._utilities: List[SmartUtility] = []
+        self._utility_manager = SmartUtilityManager()
+        
+        # Zone lookup grid and current zone of each entity
+        self.zone_grid = np.empty((5, 5), dtype=object)
+        self._zone_size = config.simulation_area / 5
+        self._default_zone: Optional[Zone] = None
+        self._entity_zones: Dict[str, Zone] = {}
         self._lock = Lock()
         self.logger = logging.getLogger("simulation")
         
+        # Vehicle metrics queued by the update loop, logged by _flush_metrics
+        self._metrics_buffer: deque = deque(maxlen=1024)
+        
         # Metrics tracking
         self.metrics = {
             'collision_alerts': 0,
@@ -59,6 +98,9 @@ class SimulationManager:
             # Create utility sensors
             self._create_utility_sensors()
             
+            # Generate sensor keys in parallel rather than one by one
+            IoTSensor.batch_init_keys(self._lights + self._utilities)
+            
             self.logger.info(
                 f"Simulation initialized with "
                 f"{len(self.entities)} entities in "
@@ -73,55 +115,189 @@ class SimulationManager:
         """Create city zones."""
         zone_size = self.config.simulation_area / 5  # 5x5 grid
         
-        for i in range(5):
-            for j in range(5):
-                zone_id = f"zone_{i}_{j}"
-                center = SphericalCoordinates(
-                    r=np.sqrt(i*i + j*j) * zone_size,
-                    theta=np.arctan2(j, i),
+        # Compute every zone center in two array operations
+        i, j = np.meshgrid(np.arange(5), np.arange(5), indexing='ij')
+        r = np.sqrt(i*i + j*j) * zone_size
+        theta = np.arctan2(j, i)
+        
+        for idx in np.ndindex(5, 5):
+            zone_id = f"zone_{idx[0]}_{idx[1]}"
+            zone = Zone(
+                zone_id=zone_id,
+                center=SphericalCoordinates(
+                    r=float(r[idx]),
+                    theta=float(theta[idx]),
                     phi=0.0
-                )
+                ),
+                radius=zone_size/2
+            )
+            self.zones[zone_id] = zone
+            self.zone_grid[idx] = zone
                 
-                zone = Zone(
-                    zone_id=zone_id,
-                    center=center,
-                    radius=zone_size/2
-                )
-                self.zones[zone_id] = zone
+        # Shared fallback for entities outside the grid
+        self._default_zone = Zone(
+            zone_id="default",
+            center=SphericalCoordinates(r=0.0, theta=0.0, phi=0.0),
+            radius=self.config.simulation_area
+        )
+        
+    def zone_index_from_cart(self, x: float, y: float) -> Tuple[int, int]:
+        """Get the grid cell whose zone center is nearest to (x, y)."""
+        return (
+            int(math.floor(x / self._zone_size + 0.5)),
+            int(math.floor(y / self._zone_size + 0.5))
+        )
+        
+    def _get_containing_zone(self, entity: Entity) -> Zone:
+        """Get the zone containing an entity with an O(1) grid lookup."""
+        coords = entity.coordinates
+        # Zone centers are laid out with theta = arctan2(j, i)
+        i, j = self.zone_index_from_cart(
+            coords.r * math.cos(coords.theta),
+            coords.r * math.sin(coords.theta)
+        )
+        if 0 <= i < 5 and 0 <= j < 5:
+            return self.zone_grid[i, j]
+        return self._default_zone
+        
+    def _update_zone_membership(self) -> None:
+        """Move entities whose containing zone changed this tick."""
+        for entity_id, entity in self.entities.items():
+            zone = self._get_containing_zone(entity)
+            previous = self._entity_zones.get(entity_id)
+            if zone is previous:
+                continue
+            if previous is not None:
+                previous.remove_entity(entity)
+            zone.add_entity(entity)
+            self._entity_zones[entity_id] = zone
+                
+    def _random_positions(self, count: int) -> List[SphericalCoordinates]:
+        """Get random positions in the simulation area."""
+        x, y = np.random.uniform(0, self.config.simulation_area, (2, count))
+        r = np.hypot(x, y)
+        theta = np.arctan2(y, x)
+        return [
+            SphericalCoordinates(r=float(r[k]), theta=float(theta[k]), phi=0.0)
+            for k in range(count)
+        ]
+        
+    def _create_vehicles(self) -> None:
+        """Create autonomous vehicles."""
+        positions = self._random_positions(self.config.vehicle_count)
+        for i, position in enumerate(positions):
+            vehicle = AutonomousVehicle(
+                vehicle_id=str(i),
+                initial_position=position,
+                max_velocity=self.config.max_velocity,
+                sensor_range=self.config.sensor_range
+            )
+            vehicle.metrics_buffer = self._metrics_buffer
+            self.entities[vehicle.entity_id] = vehicle
+            self._vehicles.append(vehicle)
+            
+    def _create_traffic_lights(self) -> None:
+        """Create traffic lights."""
+        positions = self._random_positions(self.config.traffic_light_count)
+        for i, position in enumerate(positions):
+            light = TrafficLight(
+                light_id=str(i),
+                position=position
+            )
+            self.entities[light.entity_id] = light
+            self._lights.append(light)
+            
+    def _create_utility_sensors(self) -> None:
+        """Create smart utility sensors."""
+        utility_types = ('power', 'water', 'gas')
+        positions = self._random_positions(self.config.utility_sensor_count)
+        for i, position in enumerate(positions):
+            utility = SmartUtility(
+                utility_id=str(i),
+                utility_type=utility_types[i % len(utility_types)],
+                position=position,
+                capacity=100.0
+            )
+            self.entities[utility.entity_id] = utility
+            self._utilities.append(utility)
+            self._utility_manager.register(utility)
                 
     async def run(self) -> None:
         """Run the simulation."""
         self.running = True
-        last_update = datetime.utcnow()
+        interval_ns = int(self.config.update_interval * 1e9)
+        last_update_ns = monotonic_ns()
+        next_tick_ns = last_update_ns + interval_ns
+        flush_task = asyncio.create_task(self._flush_metrics())
         
         try:
             while self.running:
-                now = datetime.utcnow()
-                delta_time = (now - last_update).total_seconds()
-                
-                if delta_time >= self.config.update_interval:
-                    await self._update(delta_time)
-                    last_update = now
+                # Sleep exactly until the next tick deadline
+                sleep_ns = next_tick_ns - monotonic_ns()
+                if sleep_ns > 0:
+                    await asyncio.sleep(sleep_ns * 1e-9)
                     
-                await asyncio.sleep(self.config.update_interval / 10)
+                now_ns = monotonic_ns()
+                await self._update((now_ns - last_update_ns) * 1e-9)
+                last_update_ns = now_ns
+                
+                # Keep a fixed cadence; resync instead of bursting when behind
+                next_tick_ns += interval_ns
+                if next_tick_ns < now_ns:
+                    next_tick_ns = now_ns + interval_ns
                 
         except Exception as e:
             self.logger.error(f"Simulation run failed: {str(e)}")
             self.stop()
             raise
             
+        finally:
+            flush_task.cancel()
+            self._drain_metrics()
+            
+    async def _flush_metrics(self) -> None:
+        """Periodically log buffered vehicle metrics."""
+        while self.running:
+            await asyncio.sleep(1.0)
+            self._drain_metrics()
+            
+    def _drain_metrics(self) -> None:
+        """Log and clear all buffered vehicle metrics."""
+        buffer = self._metrics_buffer
+        while buffer:
+            (vehicle_id, position, velocity, collision_risk,
+             route_efficiency, timestamp) = buffer.popleft()
+            self.logger.info(
+                "Vehicle metrics: %s",
+                {
+                    'vehicle_id': vehicle_id,
+                    'position': position.to_dict(),
+                    'velocity': velocity.tolist(),
+                    'collision_risk': collision_risk,
+                    'route_efficiency': route_efficiency,
+                    'timestamp': timestamp.isoformat()
+                }
+            )
+            
     async def _update(self, delta_time: float) -> None:
         """Update simulation state."""
         with self._lock:
             try:
+                # Index positions once so vehicle scans are tree queries
+                spatial_index = SpatialIndex(list(self.entities.values()))
+                
                 # Update all entities
-                for entity in self.entities.values():
-                    if isinstance(entity, AutonomousVehicle):
-                        entity.update(delta_time)
-                    elif isinstance(entity, (TrafficLight, SmartUtility)):
-                        entity.update()
+                for vehicle in self._vehicles:
+                    vehicle.spatial_index = spatial_index
+                    vehicle.update(delta_time)
+                for light in self._lights:
+                    light.update()
+                self._utility_manager.step()
+                for utility in self._utilities:
+                    utility.update()
                 
                 # Update zones
+                self._update_zone_membership()
                 for zone in self.zones.values():
                     zone.update()
                 
@@ -137,29 +313,22 @@ class SimulationManager:
         """Update simulation metrics."""
         try:
             # Calculate collision alerts
-            collision_alerts = sum(
-                1 for entity in self.entities.values()
-                if isinstance(entity, AutonomousVehicle) and
-                entity.state.collision_risk > 0.8
+            collision_risks = np.fromiter(
+                (vehicle.state.collision_risk for vehicle in self._vehicles),
+                dtype=np.float32,
+                count=len(self._vehicles)
             )
+            collision_alerts = int(np.sum(collision_risks > 0.8))
             
             # Calculate traffic congestion
-            traffic_lights = [
-                entity for entity in self.entities.values()
-                if isinstance(entity, TrafficLight)
-            ]
-            avg_congestion = np.mean([
-                light.vehicle_count for light in traffic_lights
-            ])
+            avg_congestion = np.mean(np.fromiter(
+                (light.vehicle_count for light in self._lights),
+                dtype=np.float32,
+                count=len(self._lights)
+            ))
             
             # Calculate utility efficiency
-            utilities = [
-                entity for entity in self.entities.values()
-                if isinstance(entity, SmartUtility)
-            ]
-            avg_efficiency = np.mean([
-                utility.efficiency for utility in utilities
-            ])
+            avg_efficiency = np.mean(self._utility_manager.efficiency)
             
             # Update metrics
             self.metrics.update({
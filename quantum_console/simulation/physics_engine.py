@@ -3,16 +3,35 @@ Quantum-enhanced physics engine for simulating real-world dynamics.
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING
 from dataclasses import dataclass, field
 import logging
 import asyncio
+import time
+import numba
 from concurrent.futures import ThreadPoolExecutor
-from cfir.entities import Entity, Zone
+from scipy.spatial import cKDTree
 from ..spatial_auth import SphericalCoordinates
+from ._kernels import sph2cart, cart2sph, _step_kernel, _resolve_pairs
+from ._morton import morton_order
+from ._physics_store import _PhysicsStore
+
+if TYPE_CHECKING:
+    from cfir.entities import Entity, Zone
 
 logger = logging.getLogger(__name__)
 
+# Most timesteps simulated per wake-up when the loop falls behind
+MAX_SUBSTEPS = 5
+
+def coordinates_to_cartesian(coordinates: List[SphericalCoordinates]) -> np.ndarray:
+    """Convert a list of coordinates to (N,3) cartesian rows in one call."""
+    n = len(coordinates)
+    r = np.fromiter((c.r for c in coordinates), dtype=np.float64, count=n)
+    theta = np.fromiter((c.theta for c in coordinates), dtype=np.float64, count=n)
+    phi = np.fromiter((c.phi for c in coordinates), dtype=np.float64, count=n)
+    return sph2cart(r, theta, phi, np.empty((n, 3)))
+
 @dataclass
 class PhysicalProperties:
     """Physical properties of an entity."""
@@ -59,12 +78,22 @@ class PhysicsEngine:
     """Real-time physics simulation engine."""
     
     def __init__(self, thread_pool_size: int = 4):
-        """Initialize physics engine with optional thread pool size."""
-        self.entities: Dict[str, Tuple[Entity, PhysicalProperties]] = {}
-        self.zones: Dict[str, Tuple[Zone, EnvironmentalConditions]] = {}
+        """Initialize physics engine with optional worker thread count."""
+        self.entities: Dict[str, Tuple['Entity', PhysicalProperties]] = {}
+        self.zones: Dict[str, Tuple['Zone', EnvironmentalConditions]] = {}
         self.timestep = 0.016  # ~60 FPS
+        self._accumulator = 0.0
+        self._last_t = time.perf_counter()
+        self.collision_threshold = 1.0  # meters
+        self.reorder_interval = 64  # ticks between Morton re-sorts
         self.logger = logging.getLogger("physics_engine")
+        self._num_threads = max(
+            1,
+            min(thread_pool_size, numba.config.NUMBA_NUM_THREADS)
+        )
         self._thread_pool = ThreadPoolExecutor(max_workers=thread_pool_size)
+        self._thread_pool_size = thread_pool_size
+        self._impulse_scratch = np.zeros((thread_pool_size, 0, 3))
         self._running = False
         self._stats = {
             'updates': 0,
@@ -72,26 +101,49 @@ class PhysicsEngine:
             'avg_update_time': 0.0
         }
         
+        # Structure-of-arrays entity state, one row per entity
+        self._store = _PhysicsStore()
+        self._ticks_since_reorder = 0
+        
+        # Zone conditions, one row per zone
+        self._refresh_zone_arrays()
+        
     @property
     def stats(self) -> Dict[str, Any]:
         """Get engine statistics."""
         return self._stats.copy()
         
     def add_entity(self, 
-                   entity: Entity, 
+                   entity: 'Entity', 
                    properties: PhysicalProperties) -> None:
         """Add an entity to the physics simulation."""
         if entity.id in self.entities:
             raise ValueError(f"Entity {entity.id} already exists")
         self.entities[entity.id] = (entity, properties)
         
+        if self._store.append(entity.id,
+                              entity.coordinates.to_cartesian(),
+                              properties):
+            self._bind_properties()
+        else:
+            self._bind_properties(entity.id)
+        
     def remove_entity(self, entity_id: str) -> None:
         """Remove an entity from the simulation."""
         if entity_id in self.entities:
-            del self.entities[entity_id]
+            _, properties = self.entities.pop(entity_id)
+            
+            # Detach the removed entity's vectors from its row before
+            # another entity is swapped into it
+            properties.velocity = np.array(properties.velocity)
+            properties.acceleration = np.array(properties.acceleration)
+            
+            moved = self._store.remove(entity_id)
+            if moved is not None:
+                self._bind_properties(moved)
             
     def add_zone(self,
-                 zone: Zone,
+                 zone: 'Zone',
                  conditions: Optional[EnvironmentalConditions] = None) -> None:
         """Add a zone with environmental conditions."""
         if zone.id in self.zones:
@@ -99,18 +151,234 @@ class PhysicsEngine:
         if conditions is None:
             conditions = EnvironmentalConditions()
         self.zones[zone.id] = (zone, conditions)
+        self._refresh_zone_arrays()
         
     def remove_zone(self, zone_id: str) -> None:
         """Remove a zone from the simulation."""
         if zone_id in self.zones:
             del self.zones[zone_id]
+            self._refresh_zone_arrays()
+            
+    def _refresh_zone_arrays(self) -> None:
+        """Rebuild the per-zone condition arrays.
+        
+        Without zones a single default-conditions row of unbounded
+        radius is used.
+        """
+        zones = list(self.zones.values())
+        if not zones:
+            zones = [(None, EnvironmentalConditions())]
+        self._zone_centers = np.array(
+            [zone.center.to_cartesian() if zone else (0.0, 0.0, 0.0)
+             for zone, _ in zones],
+            dtype=np.float64
+        ).reshape(-1, 3)
+        self._zone_radius = np.array(
+            [zone.radius if zone else np.inf for zone, _ in zones],
+            dtype=np.float64
+        )
+        self._zone_gravity = np.array([c.gravity for _, c in zones])
+        self._zone_air_density = np.array([c.air_density for _, c in zones])
+        self._zone_wind = np.array(
+            [c.wind_velocity for _, c in zones],
+            dtype=np.float64
+        ).reshape(-1, 3)
             
     async def start(self) -> None:
-        """Start the physics simulation loop."""
+        """Start the physics simulation loop.
+        
+        Runs a fixed-timestep accumulator: each wake-up advances as many
+        whole timesteps as real time has elapsed, then sleeps for the
+        rest of the current step. Scheduler jitter changes how many steps
+        run per wake-up, never the step size. If updates fall behind real
+        time, at most MAX_SUBSTEPS steps run per wake-up and the backlog
+        beyond that is dropped, so the loop still yields to stop().
+        """
         self._running = True
         self.logger.info("Starting physics simulation")
+        # Thread count is per calling thread; the loop below runs on this one
+        numba.set_num_threads(self._num_threads)
+        self._accumulator = 0.0
+        self._last_t = time.perf_counter()
         while self._running:
-            # Update logic here
-            await asyncio.sleep(self.timestep)
+            now = time.perf_counter()
+            self._accumulator += now - self._last_t
+            self._last_t = now
+            self._accumulator = min(
+                self._accumulator,
+                self.timestep * MAX_SUBSTEPS
+            )
+            while self._accumulator >= self.timestep:
+                self.update(self.timestep)
+                self._accumulator -= self.timestep
+            await asyncio.sleep(
+                max(0.0, self.timestep - (time.perf_counter() - now))
+            )
+            
+    def stop(self) -> None:
+        """Stop the physics simulation loop."""
+        self._running = False
+        self.sync_entities()
+        self.logger.info("Stopping physics simulation")
+        
+    def update(self, delta_time: float) -> None:
+        """Advance the simulation by one timestep."""
+        if not self.entities:
+            return
+            
+        start_time = time.perf_counter()
+        store = self._store
+        positions = store.positions
+        
+        # Forces and integration for all entities in one parallel kernel
+        _step_kernel(
+            positions,
+            store.velocities,
+            store.accelerations,
+            store.mass,
+            store.friction,
+            self._get_zone_ids(positions),
+            self._zone_gravity,
+            self._zone_air_density,
+            self._zone_wind,
+            delta_time
+        )
+        
+        # Broad phase: one KD-tree query yields every colliding pair
+        pairs = self._detect_collisions(positions)
+        self._step_collisions(positions, pairs)
+        
+        # Keep spatially close entities in neighbouring rows
+        self._ticks_since_reorder += 1
+        if self._ticks_since_reorder >= self.reorder_interval:
+            self._reorder_rows()
+        
+        # Update statistics
+        elapsed = time.perf_counter() - start_time
+        self._stats['updates'] += 1
+        if self._stats['updates'] == 1:
+            self._stats['avg_update_time'] = elapsed
+        else:
+            self._stats['avg_update_time'] = (
+                0.95 * self._stats['avg_update_time'] + 0.05 * elapsed
+            )
+        
+    def _get_zone_ids(self, positions: np.ndarray) -> np.ndarray:
+        """Get the index of each entity's nearest zone.
+        
+        Entities farther from that zone's center than its radius get -1.
+        """
+        offsets = positions[:, None, :] - self._zone_centers[None, :, :]
+        dist_sq = np.sum(offsets * offsets, axis=2)
+        zone_ids = np.argmin(dist_sq, axis=1)
+        nearest = dist_sq[np.arange(len(zone_ids)), zone_ids]
+        zone_ids[nearest > self._zone_radius[zone_ids] ** 2] = -1
+        return zone_ids
+        
+    def get_coordinates(self, entity_id: str) -> SphericalCoordinates:
+        """Get an entity's current position in spherical coordinates."""
+        return SphericalCoordinates.from_cartesian(
+            *self._store.positions[self._store.id_to_idx[entity_id]]
+        )
+        
+    def set_coordinates(self,
+                        entity_id: str,
+                        coordinates: SphericalCoordinates) -> None:
+        """Move an entity to a new position."""
+        entity, _ = self.entities[entity_id]
+        row = self._store.id_to_idx[entity_id]
+        self._store.positions[row] = coordinates.to_cartesian()
+        entity.coordinates = coordinates
+        
+    def sync_entities(self) -> None:
+        """Write simulated positions back to the entity objects.
+        
+        Physics runs on cartesian arrays; spherical coordinates are only
+        materialized here and in get_coordinates.
+        """
+        positions = self._store.positions
+        spherical = cart2sph(positions, np.empty_like(positions))
+        for row, entity_id in enumerate(self._store.ids):
+            r, theta, phi = spherical[row]
+            self.entities[entity_id][0].coordinates = SphericalCoordinates(
+                float(r),
+                float(theta),
+                float(phi)
+            )
+            
+    def _bind_properties(self, entity_id: Optional[str] = None) -> None:
+        """Point entity property vectors at their array rows.
+        
+        Rebinds one entity, or all of them after the columns were
+        reallocated. In-place writes to properties.velocity then land
+        directly in the engine state.
+        """
+        store = self._store
+        ids = store.ids if entity_id is None else [entity_id]
+        for entity_id in ids:
+            row = store.id_to_idx[entity_id]
+            properties = self.entities[entity_id][1]
+            properties.velocity = store.velocities[row]
+            properties.acceleration = store.accelerations[row]
+        
+    def _reorder_rows(self) -> None:
+        """Sort the entity rows along a Morton curve.
+        
+        Neighbours in space become neighbours in memory, which keeps the
+        KD-tree build and the impulse gathers cache friendly.
+        """
+        self._ticks_since_reorder = 0
+        if len(self._store) < 2:
+            return
+        order = morton_order(self._store.positions, self.collision_threshold)
+        self._store.reorder(order)
+        self._bind_properties()
+        
+    def _detect_collisions(self, positions: np.ndarray) -> np.ndarray:
+        """Find all entity pairs closer than the collision threshold."""
+        if len(positions) < 2:
+            return np.empty((0, 2), dtype=np.intp)
+        tree = cKDTree(positions)
+        return tree.query_pairs(self.collision_threshold, output_type='ndarray')
+        
+    def _step_collisions(self,
+                         positions: np.ndarray,
+                         pairs: np.ndarray) -> None:
+        """Resolve all colliding pairs across the thread pool.
+        
+        The pairs are split into contiguous ranges, one per worker. Each
+        worker runs the nogil narrow-phase kernel into its own scratch
+        buffer, and the buffers are summed into the velocities after the
+        workers join.
+        """
+        self._stats['collisions'] += len(pairs)
+        if len(pairs) == 0:
+            return
+            
+        store = self._store
+        n = len(store)
+        if self._impulse_scratch.shape[1] < n:
+            self._impulse_scratch = np.zeros(
+                (self._thread_pool_size, max(n, 2 * self._impulse_scratch.shape[1]), 3)
+            )
+        
+        # Small batches are not worth the hand-off to other threads
+        workers = max(1, min(self._thread_pool_size, len(pairs) // 256))
+        bounds = np.linspace(0, len(pairs), workers + 1).astype(np.intp)
+        scratch = self._impulse_scratch[:workers, :n]
+        scratch.fill(0.0)
+        pair_i = np.ascontiguousarray(pairs[:, 0])
+        pair_j = np.ascontiguousarray(pairs[:, 1])
+        
+        def resolve(k: int) -> None:
+            _resolve_pairs(
+                pair_i, pair_j, bounds[k], bounds[k + 1],
+                positions, store.velocities, store.mass, store.elasticity,
+                scratch[k]
+            )
             
-    # Continue with the rest of the methods... 
\ No newline at end of file
+        if workers == 1:
+            resolve(0)
+        else:
+            list(self._thread_pool.map(resolve, range(workers)))
+        np.add(store.velocities, scratch.sum(axis=0), out=store.velocities)
\ No newline at end of file
@@ -1,16 +1,28 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union
 import numpy as np
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from threading import Lock
-import json
+from time import monotonic_ns
+import msgpack
 
 from cfir.entities import Entity, Zone
 from ..spatial_auth import SphericalCoordinates
+from ._kernels import _utility_step
 from quantum_encryption import QuantumEncryption
 
-@dataclass
+# QuantumEncryption is stateless; share the class instead of per-sensor instances
+_ENC = QuantumEncryption
+
+_NOISE_BLOCK = 1024  # load-noise samples drawn per RNG call
+
+def _generate_keypair(_: int) -> Dict[str, bytes]:
+    """Generate one Kyber key pair (thread pool worker)."""
+    return _ENC.generate_kyber_keypair()
+
+@dataclass(slots=True)
 class SensorReading:
     """IoT sensor reading."""
     sensor_id: str
@@ -29,7 +41,7 @@ class IoTSensor(Entity):
         sensor_type: str,
         position: SphericalCoordinates,
         update_interval: float = 1.0,  # seconds
-        encryption_key: Optional[str] = None
+        encryption_key: Optional[bytes] = None
     ):
         super().__init__(
             coordinates=position,
@@ -41,14 +53,20 @@ class IoTSensor(Entity):
         self.sensor_type = sensor_type
         self.update_interval = update_interval
         self.last_update = datetime.utcnow()
+        self._last_update_ns = monotonic_ns()
+        self._interval_ns = int(update_interval * 1e9)
         
-        # Initialize encryption
-        self.encryption = QuantumEncryption()
+        # Initialize encryption; the key is generated on first use
+        self._encryption_key: Optional[bytes] = None
+        self.decryption_key: Optional[bytes] = None
         if encryption_key:
             self.encryption_key = encryption_key
-        else:
-            keys = self.encryption.generate_kyber_keypair()
-            self.encryption_key = keys['private_key']
+        
+        # Fields that never change are packed once
+        self._static_prefix = msgpack.packb({
+            'sensor_id': sensor_id,
+            'sensor_type': sensor_type
+        })
         
         # Thread safety
         self._reading_lock = Lock()
@@ -56,15 +74,53 @@ class IoTSensor(Entity):
         # Logging
         self.logger = logging.getLogger(f"iot_{sensor_id}")
         
+    @property
+    def encryption_key(self) -> bytes:
+        """Sensor (public) encryption key, generated lazily."""
+        if not self._encryption_key:
+            self._set_keys(_ENC.generate_kyber_keypair())
+        return self._encryption_key
+        
+    @encryption_key.setter
+    def encryption_key(self, key: Union[str, bytes]) -> None:
+        # Serialized keys are decoded once, here
+        if isinstance(key, str):
+            key = _ENC.deserialize_key(key)
+        self._encryption_key = key
+        
+    def _set_keys(self, keys: Dict[str, bytes]) -> None:
+        """Adopt a generated key pair."""
+        self.encryption_key = keys['public_key']
+        self.decryption_key = keys['private_key']
+        
+    @classmethod
+    def batch_init_keys(cls, sensors: List['IoTSensor']) -> None:
+        """Generate missing keys for many sensors across threads.
+        
+        The native Kyber keygen runs without the GIL, so threads overlap
+        it without forking a process pool (unsafe once the simulation's
+        logging, metrics or render threads exist).
+        """
+        pending = [sensor for sensor in sensors if not sensor._encryption_key]
+        if not pending:
+            return
+        with ThreadPoolExecutor() as pool:
+            keys = pool.map(_generate_keypair, range(len(pending)))
+            for sensor, pair in zip(pending, keys):
+                sensor._set_keys(pair)
+        
     def update(self) -> Optional[SensorReading]:
         """Update sensor reading."""
-        now = datetime.utcnow()
-        if (now - self.last_update).total_seconds() < self.update_interval:
+        now_ns = monotonic_ns()
+        if now_ns - self._last_update_ns < self._interval_ns:
             return None
             
         with self._reading_lock:
             try:
-                reading = self._take_reading()
+                # Wall-clock time only for the stored reading
+                now = datetime.utcnow()
+                reading = self._take_reading(now)
+                self._last_update_ns = now_ns
                 self.last_update = now
                 
                 # Encrypt and store reading
@@ -80,32 +136,38 @@ class IoTSensor(Entity):
                 self.logger.error(f"Sensor update failed: {str(e)}")
                 return None
                 
-    def _take_reading(self) -> SensorReading:
-        """Take a sensor reading."""
+    def _take_reading(self, now: datetime) -> SensorReading:
+        """Take a sensor reading stamped with now."""
         raise NotImplementedError
         
     def encrypt_reading(self, reading: SensorReading) -> Dict:
-        """Encrypt sensor reading."""
+        """Encrypt sensor reading.
+        
+        The plaintext is the packed static fields followed by a second
+        msgpack object with the per-reading fields.
+        """
         try:
-            data = {
-                'sensor_id': reading.sensor_id,
-                'sensor_type': reading.sensor_type,
+            ts_ns = int(reading.timestamp.timestamp() * 1e9)
+            coords = reading.coordinates
+            dynamic = msgpack.packb({
                 'value': reading.value,
-                'timestamp': reading.timestamp.isoformat(),
-                'coordinates': reading.coordinates.to_dict(),
-                'confidence': reading.confidence
-            }
+                'ts_ns': ts_ns,
+                'coords': (coords.r, coords.theta, coords.phi),
+                'conf': reading.confidence
+            })
             
-            encrypted = self.encryption.encrypt_data(
+            encrypted = _ENC.encrypt_data(
                 self.encryption_key,
-                json.dumps(data)
+                self._static_prefix + dynamic
             )
             
             return {
-                'encrypted_data': encrypted['ciphertext'],
+                'encrypted_data': encrypted['ct'],
+                'kem_ciphertext': encrypted['kem_ct'],
+                'nonce': encrypted['nonce'],
                 'metadata': {
                     'sensor_id': reading.sensor_id,
-                    'timestamp': reading.timestamp.isoformat()
+                    'ts_ns': ts_ns
                 }
             }
             
@@ -131,9 +193,9 @@ class TrafficLight(IoTSensor):
         
         self.state = initial_state
         self.vehicle_count = 0
-        self.wait_times: Dict[str, float] = {}
+        self.wait_times: Dict[str, int] = {}  # arrival, monotonic ns
         
-    def _take_reading(self) -> SensorReading:
+    def _take_reading(self, now: datetime) -> SensorReading:
         """Monitor traffic conditions."""
         try:
             # Detect vehicles
@@ -141,13 +203,13 @@ class TrafficLight(IoTSensor):
             self.vehicle_count = len(nearby)
             
             # Update wait times
-            self._update_wait_times(nearby)
+            self._update_wait_times(nearby, monotonic_ns())
             
             return SensorReading(
                 sensor_id=self.sensor_id,
                 sensor_type=self.sensor_type,
                 value=self.vehicle_count,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 coordinates=self.coordinates,
                 confidence=0.95
             )
@@ -156,20 +218,20 @@ class TrafficLight(IoTSensor):
             self.logger.error(f"Traffic monitoring failed: {str(e)}")
             raise
             
-    def _update_wait_times(self, nearby_vehicles: List[Entity]) -> None:
+    def _update_wait_times(
+        self,
+        nearby_vehicles: List[Entity],
+        now_ns: int
+    ) -> None:
         """Update vehicle wait times."""
-        now = datetime.utcnow()
+        present = {v.entity_id for v in nearby_vehicles}
         
         # Add new vehicles
-        for vehicle in nearby_vehicles:
-            if vehicle.entity_id not in self.wait_times:
-                self.wait_times[vehicle.entity_id] = now.timestamp()
+        for vehicle_id in present - self.wait_times.keys():
+            self.wait_times[vehicle_id] = now_ns
         
         # Remove departed vehicles
-        departed = set(self.wait_times.keys()) - {
-            v.entity_id for v in nearby_vehicles
-        }
-        for vehicle_id in departed:
+        for vehicle_id in self.wait_times.keys() - present:
             del self.wait_times[vehicle_id]
 
 class SmartUtility(IoTSensor):
@@ -192,21 +254,57 @@ class SmartUtility(IoTSensor):
         
         self.utility_type = utility_type
         self.capacity = capacity
-        self.current_load = 0.0
-        self.efficiency = 1.0
+        self._current_load = 0.0
+        self._efficiency = 1.0
+        
+        # Set when a SmartUtilityManager owns this sensor's state
+        self._manager: Optional['SmartUtilityManager'] = None
+        self._idx = -1
+        
+        # Load noise is drawn in blocks from a per-sensor generator
+        self._rng = np.random.default_rng()
+        self._noise_buf = self._rng.standard_normal(_NOISE_BLOCK) * 0.1
+        self._noise_i = 0
+        
+    @property
+    def current_load(self) -> float:
+        if self._manager is not None:
+            return float(self._manager.load[self._idx])
+        return self._current_load
         
-    def _take_reading(self) -> SensorReading:
+    @current_load.setter
+    def current_load(self, value: float) -> None:
+        if self._manager is not None:
+            self._manager.load[self._idx] = value
+        else:
+            self._current_load = value
+            
+    @property
+    def efficiency(self) -> float:
+        if self._manager is not None:
+            return float(self._manager.efficiency[self._idx])
+        return self._efficiency
+        
+    @efficiency.setter
+    def efficiency(self, value: float) -> None:
+        if self._manager is not None:
+            self._manager.efficiency[self._idx] = value
+        else:
+            self._efficiency = value
+        
+    def _take_reading(self, now: datetime) -> SensorReading:
         """Monitor utility metrics."""
         try:
-            # Simulate load and efficiency changes
-            self._update_load()
-            self._update_efficiency()
+            # Simulate load and efficiency changes, unless batched
+            if self._manager is None:
+                self._update_load()
+                self._update_efficiency()
             
             return SensorReading(
                 sensor_id=self.sensor_id,
                 sensor_type=self.sensor_type,
                 value=self.current_load,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 coordinates=self.coordinates,
                 confidence=self.efficiency
             )
@@ -218,13 +316,77 @@ class SmartUtility(IoTSensor):
     def _update_load(self) -> None:
         """Update current load."""
         # Implement realistic load simulation here
+        if self._noise_i == _NOISE_BLOCK:
+            self._rng.standard_normal(out=self._noise_buf)
+            self._noise_buf *= 0.1
+            self._noise_i = 0
+        delta = self._noise_buf[self._noise_i]
+        self._noise_i += 1
+        
         self.current_load = min(
             self.capacity,
-            max(0, self.current_load + np.random.normal(0, 0.1))
+            max(0, self.current_load + delta)
         )
         
     def _update_efficiency(self) -> None:
         """Update system efficiency."""
         # Implement efficiency calculation here
         load_factor = self.current_load / self.capacity
-        self.efficiency = 1.0 - (load_factor ** 2) * 0.2 
\ No newline at end of file
+        self.efficiency = 1.0 - (load_factor ** 2) * 0.2 
+
+class SmartUtilityManager:
+    """Batched load and efficiency state for many utility sensors.
+    
+    Columns are allocated with spare capacity that doubles when full;
+    the accessors return views of the registered rows only.
+    """
+    
+    def __init__(self, initial_capacity: int = 64):
+        self._capacity = np.zeros(initial_capacity, dtype=np.float32)
+        self._load = np.zeros(initial_capacity, dtype=np.float32)
+        self._efficiency = np.zeros(initial_capacity, dtype=np.float32)
+        self._n = 0
+        self._index: Dict[str, int] = {}
+        self._rng = np.random.default_rng()
+        
+    @property
+    def capacity(self) -> np.ndarray:
+        return self._capacity[:self._n]
+        
+    @property
+    def load(self) -> np.ndarray:
+        return self._load[:self._n]
+        
+    @property
+    def efficiency(self) -> np.ndarray:
+        return self._efficiency[:self._n]
+        
+    def _grow(self, size: int) -> None:
+        for name in ("_capacity", "_load", "_efficiency"):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[:self._n] = column[:self._n]
+            setattr(self, name, grown)
+            
+    def register(self, utility: SmartUtility) -> None:
+        """Move a sensor's state into the shared arrays."""
+        if utility.sensor_id in self._index:
+            raise ValueError(f"Utility {utility.sensor_id} already registered")
+        idx = self._n
+        if idx == len(self._load):
+            self._grow(max(2 * idx, 1))
+        self._capacity[idx] = utility.capacity
+        self._load[idx] = utility.current_load
+        self._efficiency[idx] = utility.efficiency
+        self._n = idx + 1
+        self._index[utility.sensor_id] = idx
+        utility._manager = self
+        utility._idx = idx
+        
+    def step(self) -> None:
+        """Advance the load and efficiency of every sensor at once."""
+        if not self._n:
+            return
+        noise = self._rng.standard_normal(self._n, dtype=np.float32)
+        noise *= 0.1
+        _utility_step(self.load, self.capacity, self.efficiency, noise)
\ No newline at end of file
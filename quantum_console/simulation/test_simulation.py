@@ -6,7 +6,6 @@ import asyncio
 import logging
 import numpy as np
 from typing import List, Tuple
-import random
 from .physics_engine import PhysicsEngine, PhysicalProperties, EnvironmentalConditions
 from cfir.entities import Entity, Zone
 from ..spatial_auth import SphericalCoordinates
@@ -20,52 +19,52 @@ class PhysicsSimulation:
     def __init__(self, num_entities: int = 10):
         self.engine = PhysicsEngine()
         self.num_entities = num_entities
+        self._rng = np.random.default_rng()
         
-    def _create_random_entity(self, entity_id: str) -> Tuple[Entity, PhysicalProperties]:
-        """Create a random entity with physical properties."""
+    def _create_random_entities_batch(
+        self,
+        n: int
+    ) -> List[Tuple[Entity, PhysicalProperties]]:
+        """Create n random entities, drawing all random values at once."""
         try:
-            # Random position on sphere (using degrees for easier visualization)
-            lat = random.uniform(-90, 90)  # Latitude in degrees (-90 to 90)
-            lon = random.uniform(-180, 180)  # Longitude in degrees (-180 to 180)
-            r = float(100.0)  # Ensure float type
-            
-            # Convert to radians for SphericalCoordinates
-            lat_rad = float(np.radians(lat))
-            lon_rad = float(np.radians(lon))
-            
-            # Print debug values before creation
-            print(f"DEBUG - Creating coordinates with: lat={lat_rad}, lon={lon_rad}, r={r}")
-            print(f"DEBUG - Types: lat={type(lat_rad)}, lon={type(lon_rad)}, r={type(r)}")
-            
-            # Create coordinates step by step
-            try:
-                coords = SphericalCoordinates(lat_rad, lon_rad, r)
-            except ValueError as ve:
-                print(f"DEBUG - Coordinate creation failed with values:")
-                print(f"  lat_rad: {lat_rad} ({type(lat_rad)})")
-                print(f"  lon_rad: {lon_rad} ({type(lon_rad)})")
-                print(f"  r: {r} ({type(r)})")
-                raise
-            
-            # Create entity
-            entity = Entity(entity_id, coords)
-            
-            properties = PhysicalProperties(
-                mass=random.uniform(1.0, 10.0),
-                velocity=np.array([
-                    random.uniform(-5, 5),
-                    random.uniform(-5, 5),
-                    random.uniform(-5, 5)
-                ]),
-                friction_coefficient=random.uniform(0.1, 0.9),
-                elasticity=random.uniform(0.5, 0.95),
-                density=random.uniform(0.5, 2.0)
-            )
+            rng = self._rng
+            
+            # Random positions on sphere (using degrees for easier visualization)
+            lats = rng.uniform(-90, 90, n)  # Latitude in degrees (-90 to 90)
+            lons = rng.uniform(-180, 180, n)  # Longitude in degrees (-180 to 180)
+            
+            # Polar angle is measured from the pole, not the equator;
+            # both angles are brought into range here, once for all
+            thetas = np.radians(90.0 - lats) % np.pi
+            phis = np.radians(lons) % (2 * np.pi)
+            
+            velocities = rng.uniform(-5, 5, (n, 3))
+            masses = rng.uniform(1.0, 10.0, n)
+            frictions = rng.uniform(0.1, 0.9, n)
+            elasticities = rng.uniform(0.5, 0.95, n)
+            densities = rng.uniform(0.5, 2.0, n)
+            
+            entities = []
+            for i in range(n):
+                coords = SphericalCoordinates.from_radians_unchecked(
+                    r=100.0,
+                    theta=float(thetas[i]),
+                    phi=float(phis[i])
+                )
+                entity = Entity(f"entity_{i}", coords)
+                properties = PhysicalProperties(
+                    mass=masses[i],
+                    velocity=velocities[i],
+                    friction_coefficient=frictions[i],
+                    elasticity=elasticities[i],
+                    density=densities[i]
+                )
+                entities.append((entity, properties))
             
-            return entity, properties
+            return entities
             
         except Exception as e:
-            logger.error(f"Failed to create entity: {str(e)}")
+            logger.error(f"Failed to create entities: {str(e)}")
             raise
         
     def _create_zones(self) -> List[Tuple[Zone, EnvironmentalConditions]]:
@@ -79,11 +78,10 @@ class PhysicsSimulation:
                 wind_velocity=np.array([2.0, 0.0, 0.0])
             )
             
-            print("DEBUG - Creating equator zone coordinates")
             equator_coords = SphericalCoordinates(
-                float(0.0),  # Explicit float conversion
-                float(0.0), 
-                float(100.0)
+                r=100.0,
+                theta=np.pi / 2,
+                phi=0.0
             )
             
             zones.append((
@@ -98,13 +96,11 @@ class PhysicsSimulation:
                 surface_type="ice"
             )
             
-            print("DEBUG - Creating mid-latitude zone coordinates")
-            mid_lat = float(np.radians(45.0))
-            mid_lon = float(np.radians(45.0))
-            mid_r = float(100.0)
-            
-            print(f"DEBUG - Mid zone values: lat={mid_lat}, lon={mid_lon}, r={mid_r}")
-            mid_coords = SphericalCoordinates(mid_lat, mid_lon, mid_r)
+            mid_coords = SphericalCoordinates(
+                r=100.0,
+                theta=np.radians(45.0),
+                phi=np.radians(45.0)
+            )
             
             zones.append((
                 Zone("low_friction", mid_coords),
@@ -121,8 +117,9 @@ class PhysicsSimulation:
         """Run the simulation for specified duration."""
         try:
             # Create and add entities
-            for i in range(self.num_entities):
-                entity, props = self._create_random_entity(f"entity_{i}")
+            for entity, props in self._create_random_entities_batch(
+                self.num_entities
+            ):
                 self.engine.add_entity(entity, props)
                 
             # Create and add zones
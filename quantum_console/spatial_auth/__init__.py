@@ -1,5 +1,5 @@
 # Empty __init__.py to make spatial_auth a package
 
-from ...cfir.entities.coordinates import SphericalCoordinates
+from cfir.entities.coordinates import SphericalCoordinates
 
 __all__ = ['SphericalCoordinates'] 
\ No newline at end of file
@@ -1,26 +1,33 @@
 import logging
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import numpy as np
+import queue
+import threading
 from threading import Lock
+from time import monotonic_ns
 
 class MetricsVisualizer:
     """Real-time metrics visualization."""
     
+    MAX_HISTORY = 4096  # samples kept per metric
+    
     def __init__(self):
         self.logger = logging.getLogger("metrics_visualizer")
         self._lock = Lock()
         
-        # Store historical metrics
+        # Historical metrics as fixed-size ring buffers
+        n = self.MAX_HISTORY
         self.history = {
-            'timestamps': [],
-            'shard_counts': [],
-            'node_counts': [],
-            'latencies': [],
-            'success_rates': []
+            'timestamps_ns': np.zeros(n, dtype=np.int64),
+            'shard_counts': np.zeros(n, dtype=np.int32),
+            'node_counts': np.zeros(n, dtype=np.int32),
+            'latencies_ms': np.zeros(n, dtype=np.float32),
+            'success_rates': np.zeros(n, dtype=np.float32)
         }
+        self._head = 0
+        self._count = 0
         
         # Setup plots
         plt.style.use('ggplot')  # Use a built-in style that looks nice
@@ -33,8 +40,16 @@ class MetricsVisualizer:
             'success': None
         }
         
-        # Initialize plots
-        self._init_plots()
+        # Blitting state: per-axes backgrounds and the current bar set
+        self._bgs = []
+        self._bars = None
+        self._bar_nodes = None
+        
+        # Rendering runs on its own thread, which owns the figure;
+        # producers only hand over the latest metrics snapshot
+        self._q: queue.Queue = queue.Queue(maxsize=1)
+        self._stop = False
+        self._render_thread: Optional[threading.Thread] = None
         
         self.logger.info("MetricsVisualizer initialized")
         
@@ -54,13 +69,13 @@ class MetricsVisualizer:
             self.axes[0,1].set_title('Node Utilization')
             self.axes[0,1].set_xlabel('Time (s)')
             self.axes[0,1].set_ylabel('Active Nodes')
-            self.lines['node_util'], = self.axes[0,1].plot([], [], 'b-', label='Active Nodes')
+            self.lines['node_util'], = self.axes[0,1].plot([], [], 'b-', label='Active Nodes', animated=True)
             
             # Latency plot
             self.axes[1,0].set_title('Operation Latency')
             self.axes[1,0].set_xlabel('Time (s)')
             self.axes[1,0].set_ylabel('Latency (ms)')
-            self.lines['latency'], = self.axes[1,0].plot([], [], 'r-', label='Latency')
+            self.lines['latency'], = self.axes[1,0].plot([], [], 'r-', label='Latency', animated=True)
             self.axes[1,0].set_ylim([0, 100])
             
             # Success rate plot
@@ -68,15 +83,17 @@ class MetricsVisualizer:
             self.axes[1,1].set_xlabel('Time (s)')
             self.axes[1,1].set_ylabel('Success Rate (%)')
             self.axes[1,1].set_ylim([0, 150])
-            self.lines['success'], = self.axes[1,1].plot([], [], 'g-', label='Success Rate')
+            self.lines['success'], = self.axes[1,1].plot([], [], 'g-', label='Success Rate', animated=True)
             
             # Add legends and grid
             for ax in self.axes.flat:
                 ax.grid(True)
                 ax.legend()
             
-            plt.tight_layout()
+            self._bars = None
+            self._bar_nodes = None
             self.fig.show()  # Make sure window is shown
+            self._full_redraw()
             
         except Exception as e:
             self.logger.error(f"Failed to initialize plots: {str(e)}")
@@ -84,41 +101,88 @@ class MetricsVisualizer:
 
     def start(self) -> None:
         """Start the visualization."""
-        plt.ion()  # Enable interactive mode
-        if self.fig is None:
-            self._init_plots()
-        self.fig.show()
-        plt.pause(0.1)  # Small pause to ensure window appears
+        if self._render_thread is not None and self._render_thread.is_alive():
+            return
+        self._stop = False
+        self._render_thread = threading.Thread(
+            target=self._render_loop,
+            name="metrics_render",
+            daemon=True
+        )
+        self._render_thread.start()
         
     def stop(self) -> None:
         """Stop the visualization."""
-        plt.ioff()
-        if self.fig is not None:
-            plt.close(self.fig)
-            self.fig = None
-            self.axes = None
+        self._stop = True
+        self._offer(None)  # Wake the render thread
+        if self._render_thread is not None:
+            self._render_thread.join(timeout=2.0)
+            self._render_thread = None
 
     def update_metrics(self, metrics: Dict[str, Any]) -> None:
-        """Update visualization with new metrics."""
+        """Queue new metrics for the render thread.
+        
+        Never blocks: an update that has not been drawn yet is replaced
+        by the newer one.
+        """
+        if self._render_thread is None:
+            self.start()
+        self._offer(metrics)
+        
+    def _offer(self, item: Optional[Dict[str, Any]]) -> None:
+        """Put an item on the queue, dropping any stale one."""
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            try:
+                self._q.get_nowait()
+            except queue.Empty:
+                pass
+            self._q.put_nowait(item)
+            
+    def _render_loop(self) -> None:
+        """Own the figure and draw queued metrics until stopped."""
+        plt.ion()  # Enable interactive mode
+        self._init_plots()
+        try:
+            while not self._stop:
+                try:
+                    metrics = self._q.get(timeout=0.1)
+                except queue.Empty:
+                    # Keep the window responsive between updates
+                    if self.fig is not None:
+                        self.fig.canvas.flush_events()
+                    continue
+                if metrics is None:
+                    break
+                self._render(metrics)
+        finally:
+            plt.ioff()
+            if self.fig is not None:
+                plt.close(self.fig)
+                self.fig = None
+                self.axes = None
+                
+    def _render(self, metrics: Dict[str, Any]) -> None:
+        """Record one metrics snapshot and redraw the plots."""
         if self.fig is None or not plt.fignum_exists(self.fig.number):
             self._init_plots()
             
         with self._lock:
             try:
-                now = datetime.utcnow()
-                
                 # Debug logging
-                self.logger.info(f"Updating metrics: {metrics}")
+                self.logger.info("Updating metrics: %s", metrics)
                 
                 # Update history
-                self.history['timestamps'].append(now)
-                self.history['shard_counts'].append(
+                head = self._head
+                self.history['timestamps_ns'][head] = monotonic_ns()
+                self.history['shard_counts'][head] = (
                     metrics['shard_manager']['total_shards']
                 )
-                self.history['node_counts'].append(
-                    len(metrics['shard_manager'].get('nodes', {}))
+                self.history['node_counts'][head] = len(
+                    metrics['shard_manager'].get('nodes', {})
                 )
-                self.history['latencies'].append(
+                self.history['latencies_ms'][head] = (
                     metrics['test']['avg_latency'] * 1000  # Convert to ms
                 )
                 
@@ -126,65 +190,113 @@ class MetricsVisualizer:
                 operations = metrics['test']['data_operations']
                 successes = metrics['test']['successful_operations']
                 success_rate = (successes / max(operations, 1)) * 100
-                self.history['success_rates'].append(success_rate)
+                self.history['success_rates'][head] = success_rate
+                
+                self._head = (head + 1) % self.MAX_HISTORY
+                self._count = min(self._count + 1, self.MAX_HISTORY)
                 
                 self.logger.info(
-                    f"Calculating success rate: {successes}/{operations} = {success_rate:.2f}%"
+                    "Calculating success rate: %s/%s = %.2f%%",
+                    successes, operations, success_rate
                 )
                 
                 # Update plots
                 self._update_plots(metrics)
                 
-                # Force redraw
-                self.fig.canvas.draw_idle()
+                # Let the GUI process the blitted regions
                 self.fig.canvas.flush_events()
-                plt.pause(0.01)  # Small pause to allow GUI to update
                 
             except Exception as e:
                 self.logger.error(f"Failed to update metrics: {str(e)}")
                 self.logger.exception("Detailed error:")
                 
+    def _window(self, name: str) -> np.ndarray:
+        """Get the valid samples of one metric, oldest first."""
+        values = self.history[name]
+        if self._count < self.MAX_HISTORY:
+            return values[:self._count]
+        return np.concatenate((values[self._head:], values[:self._head]))
+        
+    def _full_redraw(self) -> None:
+        """Redraw the static figure and recapture the blit backgrounds.
+        
+        Only needed when axes limits, ticks or the bar set change.
+        """
+        self.fig.tight_layout()
+        self.fig.canvas.draw()
+        self._bgs = [
+            self.fig.canvas.copy_from_bbox(ax.bbox) for ax in self.axes.flat
+        ]
+        
+    def _blit(self) -> None:
+        """Redraw only the animated artists over the cached backgrounds."""
+        canvas = self.fig.canvas
+        for ax, bg in zip(self.axes.flat, self._bgs):
+            canvas.restore_region(bg)
+            for artist in list(ax.patches) + list(ax.lines):
+                if artist.get_animated():
+                    ax.draw_artist(artist)
+            canvas.blit(ax.bbox)
+        
     def _update_plots(self, metrics: Dict[str, Any]) -> None:
         """Update all plot components."""
         try:
             # Convert timestamps to relative seconds
-            start_time = min(self.history['timestamps'])
-            times = [(t - start_time).total_seconds() for t in self.history['timestamps']]
+            timestamps = self._window('timestamps_ns')
+            times = (timestamps - timestamps[0]) * 1e-9
+            node_counts = self._window('node_counts')
+            latencies = self._window('latencies_ms')
+            needs_full = False
             
-            # Shard distribution
-            self.axes[0,0].clear()
+            # Shard distribution; rebuilt only when the node set changes
             if 'shard_distribution' in metrics['test']:
                 nodes = list(metrics['test']['shard_distribution'].keys())
                 counts = list(metrics['test']['shard_distribution'].values())
-                self.axes[0,0].bar(nodes, counts)
-                self.axes[0,0].set_title('Shard Distribution')
-                self.axes[0,0].set_xlabel('Node ID')
-                self.axes[0,0].set_ylabel('Shard Count')
-                self.axes[0,0].tick_params(axis='x', rotation=45)
-                self.axes[0,0].grid(True)
+                ax = self.axes[0,0]
+                if nodes != self._bar_nodes:
+                    ax.clear()
+                    self._bars = ax.bar(nodes, counts, animated=True)
+                    self._bar_nodes = nodes
+                    ax.set_title('Shard Distribution')
+                    ax.set_xlabel('Node ID')
+                    ax.set_ylabel('Shard Count')
+                    ax.tick_params(axis='x', rotation=45)
+                    ax.grid(True)
+                    ax.set_ylim(0, max(counts, default=0) * 1.2 + 1)
+                    needs_full = True
+                else:
+                    for rect, height in zip(self._bars, counts):
+                        rect.set_height(height)
+                    if max(counts, default=0) > ax.get_ylim()[1]:
+                        ax.set_ylim(0, max(counts) * 1.2 + 1)
+                        needs_full = True
             
             # Update line plots
-            self.lines['node_util'].set_data(times, self.history['node_counts'])
-            self.lines['latency'].set_data(times, self.history['latencies'])
-            self.lines['success'].set_data(times, self.history['success_rates'])
+            self.lines['node_util'].set_data(times, node_counts)
+            self.lines['latency'].set_data(times, latencies)
+            self.lines['success'].set_data(times, self._window('success_rates'))
             
-            # Update x-axis limits for all line plots
+            # Axis limits only grow, with headroom, so most ticks can blit
             for ax in [self.axes[0,1], self.axes[1,0], self.axes[1,1]]:
-                ax.set_xlim(0, max(times) + 1)
-            
-            # Update y-axis limits
-            if len(self.history['latencies']) > 0:
-                max_latency = max(self.history['latencies'])
-                self.axes[1,0].set_ylim(0, max(100, max_latency * 1.1))  # Add 10% headroom
+                if times[-1] + 1 > ax.get_xlim()[1]:
+                    ax.set_xlim(0, 2 * (times[-1] + 1))
+                    needs_full = True
             
-            self.axes[0,1].set_ylim(0, max(self.history['node_counts']) + 1)
+            if len(latencies) > 0:
+                max_latency = float(latencies.max())
+                if max_latency > self.axes[1,0].get_ylim()[1]:
+                    self.axes[1,0].set_ylim(0, max(100, max_latency * 1.1))  # Add 10% headroom
+                    needs_full = True
             
-            # Redraw grids
-            for ax in self.axes.flat:
-                ax.grid(True)
+            max_nodes = int(node_counts.max()) + 1
+            if max_nodes != self.axes[0,1].get_ylim()[1]:
+                self.axes[0,1].set_ylim(0, max_nodes)
+                needs_full = True
             
-            plt.tight_layout()
+            if needs_full or not self._bgs:
+                self._full_redraw()
+            self._blit()
             
         except Exception as e:
             self.logger.error(f"Failed to update plots: {str(e)}")
-            self.logger.exception("Detailed error:") 
\ No newline at end of file
+            self.logger.exception("Detailed error:")
\ No newline at end of file